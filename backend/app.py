@@ -1,33 +1,157 @@
 # backend/app.py
-from flask import Flask
+from flask import Flask, Response, g, request, abort
 from dotenv import load_dotenv
 import os
+import time
+import secrets
 
 load_dotenv()  # loads .env (optional)
 
-app = Flask(
-    __name__,
-    template_folder="../frontend/templates",
-    static_folder="../frontend/static"
-)
-
-# load secret from env if available
-app.secret_key = os.urandom(24)
-
-# Register blueprints
-from routes.auth import auth_bp
-from routes.main import main_bp
-from routes.interview import interview_bp
-
-app.register_blueprint(interview_bp)
-
-
-app.register_blueprint(auth_bp)
-app.register_blueprint(main_bp)
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+SECRET_KEY_FILE = os.getenv("SECRET_KEY_FILE", os.path.join(BASE_DIR, "data", "secret_key"))
+
+
+def _load_secret_key(path=SECRET_KEY_FILE) -> str:
+    """
+    SECRET_KEY from the environment, else the key file, created on first use.
+
+    Every worker must sign sessions with the same key. The file is written
+    under a temporary name and linked into place, so workers starting at the
+    same time all end up reading the one that won.
+    """
+    key = os.getenv("SECRET_KEY")
+    if key:
+        return key
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(tmp)
+    with open(path, "r") as f:
+        return f.read().strip()
+
+
+def create_app(config=None) -> Flask:
+    """
+    Build the Flask app.
+
+    ``config`` (a mapping) overrides the defaults below. Under a pre-fork
+    server each worker calls this after forking (see wsgi.py), so the LLM
+    client, database connections and job pools, which are all created
+    lazily on first use, belong to that worker alone.
+    """
+    app = Flask(
+        __name__,
+        template_folder="../frontend/templates",
+        static_folder="../frontend/static"
+    )
+    app.config.update(
+        SESSION_COOKIE_HTTPONLY=True,
+        SESSION_COOKIE_SAMESITE="Lax",
+        METRICS_TOKEN=os.getenv("METRICS_TOKEN"),
+        ADMIN_TOKEN=os.getenv("ADMIN_TOKEN"),
+        ADMIN_EMAILS=os.getenv("ADMIN_EMAILS", ""),
+        START_BACKGROUND_TASKS=True,
+    )
+    if config:
+        app.config.update(config)
+    if not app.config.get("SECRET_KEY"):
+        app.config["SECRET_KEY"] = _load_secret_key()
+
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.main import main_bp
+    from routes.interview import interview_bp
+    from routes.history import history_bp
+    from routes.admin import admin_bp
+
+    app.register_blueprint(interview_bp)
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(main_bp)
+    app.register_blueprint(history_bp)
+    app.register_blueprint(admin_bp)
+
+    _register_metrics(app)
+    # asset_url() helper and fingerprinted /static/dist/ files
+    from services.assets import register_assets
+    register_assets(app)
+
+    if app.config["START_BACKGROUND_TASKS"]:
+        # Delete orphaned/expired answer videos in the background
+        from services.media_gc import start_background_sweeper
+        start_background_sweeper()
+
+    return app
+
+
+def warm_up():
+    """
+    Pay one-off start-up costs before the first user does: import the LLM
+    SDK and build the client, open the user/interview databases and work out
+    the password hash parameters. Safe to call from a background thread.
+    """
+    started = time.perf_counter()
+    from services.llm_client import get_llm_client
+    from services.user_store import get_user_store
+    from services.interview_store import get_interview_store
+    from services.passwords import get_password_hasher
+
+    for step in (get_llm_client, get_user_store, get_interview_store,
+                 lambda: get_password_hasher().canonical_method):
+        try:
+            step()
+        except Exception as e:
+            print("WARNING: warm-up step failed:", e)
+    print(f"INFO: worker {os.getpid()} warmed up in {time.perf_counter() - started:.2f}s")
+
+
+def _register_metrics(app):
+    """Request timing and the Prometheus /metrics endpoint."""
+    from services.metrics import REGISTRY, HTTP_REQUEST_SECONDS, HTTP_IN_FLIGHT
+
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+        g.in_flight = True
+        HTTP_IN_FLIGHT.inc()
+
+    @app.after_request
+    def _record_request_time(response):
+        started = g.pop("request_started", None)
+        if started is not None:
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                endpoint=request.endpoint or "unmatched",
+                method=request.method,
+                status=response.status_code,
+            )
+        return response
+
+    @app.teardown_request
+    def _end_request(exc=None):
+        # teardown also runs for contexts that never reached before_request
+        if g.pop("in_flight", False):
+            HTTP_IN_FLIGHT.dec()
+
+    @app.route("/metrics")
+    def metrics():
+        # optional bearer token so the endpoint can be exposed publicly
+        token = app.config.get("METRICS_TOKEN")
+        if token and request.headers.get("Authorization") != f"Bearer {token}":
+            abort(401)
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    # development server only; see wsgi.py / gunicorn.conf.py for production
+    create_app().run(debug=os.getenv("FLASK_DEBUG", "1") == "1")
 
 
 
@@ -0,0 +1,66 @@
+# backend/bench/fake_llm_server.py
+"""
+Local stand-in for the LLM provider, for load tests.
+
+Serves POST /generate with the same deterministic responses as the app's
+FakeBackend, after a configurable delay (mean plus uniform jitter).
+
+    python bench/fake_llm_server.py --port 8765 --latency-ms 800 --jitter-ms 200
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from services.llm_client import FakeBackend  # noqa: E402
+
+
+def make_handler(latency_ms: float, jitter_ms: float):
+    backend = FakeBackend(latency_ms=0)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            delay = max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000.0
+            time.sleep(delay)
+            text = backend.generate(payload.get("prompt", ""), 60, kind=payload.get("kind", "text"),
+                                    context=payload.get("context"))
+            body = json.dumps({"text": text}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_server(port: int = 0, latency_ms: float = 0, jitter_ms: float = 0):
+    """Start the server on a daemon thread; returns ``(server, url)``."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(latency_ms, jitter_ms))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/generate"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    args = parser.parse_args()
+    server, url = start_server(args.port, args.latency_ms, args.jitter_ms)
+    print(f"Fake LLM listening on {url} (latency {args.latency_ms}±{args.jitter_ms} ms)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,69 @@
+# backend/bench/hash_bench.py
+"""
+Micro-benchmark for password hashing.
+
+Measures hashes per second for a Werkzeug method string through the same
+bounded pool the app uses, at 1..N threads, and prints throughput per core
+so PASSWORD_HASH_METHOD / PASSWORD_HASH_WORKERS can be sized.
+
+    cd backend
+    python bench/hash_bench.py
+    python bench/hash_bench.py --method pbkdf2:sha256:600000 --method scrypt:16384:8:1 --seconds 3
+"""
+import os
+import sys
+import time
+import argparse
+import threading
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def measure(hasher, threads, seconds):
+    """Hash from ``threads`` callers for ``seconds``; returns (hashes, wall seconds)."""
+    count = 0
+    lock = threading.Lock()
+    stop = time.perf_counter() + seconds
+
+    def caller():
+        nonlocal count
+        while time.perf_counter() < stop:
+            hasher.hash("Bench1!password")
+            with lock:
+                count += 1
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=caller) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return count, time.perf_counter() - started
+
+
+def main(argv=None):
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Password hashing throughput per core")
+    parser.add_argument("--method", action="append", help="Werkzeug hash method (repeatable)")
+    parser.add_argument("--max-threads", type=int, default=cores)
+    parser.add_argument("--seconds", type=float, default=2.0, help="measurement time per step")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, BACKEND_DIR)
+    from services.passwords import PasswordHasher, PASSWORD_HASH_METHOD
+
+    print(f"cores: {cores}")
+    print(f"{'method':<26}{'threads':>8}{'hashes/s':>11}{'per core':>10}{'ms/hash':>9}")
+    for method in args.method or [PASSWORD_HASH_METHOD]:
+        for threads in sorted({1, *range(2, args.max_threads + 1, 2), args.max_threads}):
+            hasher = PasswordHasher(method=method, workers=threads, queue=threads)
+            hasher.hash("warm-up")
+            count, wall = measure(hasher, threads, args.seconds)
+            rate = count / wall
+            print(f"{method:<26}{threads:>8}{rate:>11.1f}{rate / min(threads, cores):>10.1f}"
+                  f"{1000.0 * threads / rate if rate else 0:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
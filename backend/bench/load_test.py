@@ -0,0 +1,292 @@
+# backend/bench/load_test.py
+"""
+Offline load test and latency benchmark for the whole app.
+
+Starts the Flask app on a local threaded server with every data store in a
+temporary directory, points the LLM client at bench/fake_llm_server.py, and
+drives concurrent candidate sessions:
+
+    signup -> login -> /main -> POST /interview
+           -> N x /interview/save_answer (synthetic webm) -> /interview/report
+
+Prints throughput and p50/p95/p99 latency per route, writes the run to
+bench/results/latest.json and compares it with bench/baseline.json.
+
+    cd backend
+    python bench/load_test.py --users 20 --questions 5 --llm-latency-ms 300
+    python bench/load_test.py --save-baseline      # accept this run as the new baseline
+"""
+import os
+import re
+import sys
+import json
+import time
+import socket
+import logging
+import contextlib
+import uuid
+import shutil
+import argparse
+import tempfile
+import threading
+import http.cookiejar
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+BACKEND_DIR = os.path.abspath(os.path.join(BENCH_DIR, ".."))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def multipart(fields, files):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode("utf-8")
+        )
+    for name, (filename, data, ctype) in files.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f"Content-Type: {ctype}\r\n\r\n".encode("utf-8") + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def add(self, route, seconds, ok):
+        with self._lock:
+            self.samples[route].append(seconds * 1000.0)
+            if not ok:
+                self.errors[route] += 1
+
+
+class Session:
+    """One simulated candidate with its own cookie jar."""
+
+    def __init__(self, base_url, recorder):
+        self.base_url = base_url
+        self.recorder = recorder
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar())
+        )
+
+    def request(self, route, path, data=None, content_type=None, method=None):
+        headers = {"Content-Type": content_type} if content_type else {}
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        started = time.perf_counter()
+        try:
+            with self.opener.open(req, timeout=120) as resp:
+                body = resp.read()
+                ok = resp.status < 400
+        except urllib.error.HTTPError as e:
+            body, ok = e.read(), False
+        except OSError:
+            body, ok = b"", False
+        self.recorder.add(route, time.perf_counter() - started, ok)
+        return body
+
+    def form(self, route, path, fields):
+        return self.request(route, path, urllib.parse.urlencode(fields).encode("utf-8"),
+                            "application/x-www-form-urlencoded")
+
+
+def run_session(base_url, recorder, user_no, questions, video_bytes, report_polls):
+    s = Session(base_url, recorder)
+    email = f"bench{user_no}-{uuid.uuid4().hex[:8]}@example.com"
+    password = "Bench1!pass"
+    s.form("/signup", "/signup", {"name": f"Bench {user_no}", "email": email, "password": password})
+    s.form("/login", "/login", {"email": email, "password": password})
+    s.request("/main", "/main")
+    page = s.form("/interview", "/interview", {
+        "role": "Backend Engineer",
+        "description": "Python, Flask, SQL, distributed systems",
+        "difficulty": "Medium",
+        "num_questions": str(questions),
+    }).decode("utf-8", "replace")
+    match = re.search(r'data-interview-id="([0-9a-f]+)"', page)
+    if not match:
+        return
+    interview_id = match.group(1)
+
+    webm = b"\x1a\x45\xdf\xa3" + os.urandom(max(0, video_bytes - 4))
+    for i in range(questions):
+        body, ctype = multipart(
+            {"interview_id": interview_id, "q_index": str(i), "question": f"Question {i+1}",
+             "transcript": "I would start by clarifying the requirements and the constraints."},
+            {"video": (f"answer_{i+1}.webm", webm, "video/webm")},
+        )
+        s.request("/interview/save_answer", "/interview/save_answer", body, ctype)
+
+    for _ in range(report_polls):
+        html = s.request("/interview/report", "/interview/report").decode("utf-8", "replace")
+        if "Scoring your answers" not in html:
+            break
+        time.sleep(0.2)
+
+
+def summarize(recorder, wall_seconds):
+    routes = {}
+    for route, samples in sorted(recorder.samples.items()):
+        routes[route] = {
+            "count": len(samples),
+            "errors": recorder.errors.get(route, 0),
+            "throughput_rps": round(len(samples) / wall_seconds, 2) if wall_seconds else 0.0,
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+        }
+    total = sum(len(v) for v in recorder.samples.values())
+    return {
+        "wall_seconds": round(wall_seconds, 3),
+        "requests": total,
+        "throughput_rps": round(total / wall_seconds, 2) if wall_seconds else 0.0,
+        "routes": routes,
+    }
+
+
+def print_table(summary):
+    print(f"{'route':<28}{'count':>7}{'err':>5}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for route, r in summary["routes"].items():
+        print(f"{route:<28}{r['count']:>7}{r['errors']:>5}{r['throughput_rps']:>9}"
+              f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}")
+    print(f"total: {summary['requests']} requests in {summary['wall_seconds']}s "
+          f"({summary['throughput_rps']} req/s)")
+
+
+def compare(summary, baseline, tolerance, min_delta_ms=0.0):
+    """Return routes whose p95 regressed by more than ``tolerance`` (and ``min_delta_ms``) vs the baseline."""
+    regressions = []
+    for route, r in summary["routes"].items():
+        base = baseline.get("routes", {}).get(route)
+        if not base or not base.get("p95_ms"):
+            continue
+        limit = max(base["p95_ms"] * (1 + tolerance), base["p95_ms"] + min_delta_ms)
+        if r["p95_ms"] > limit:
+            regressions.append((route, base["p95_ms"], r["p95_ms"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test for the interview app")
+    parser.add_argument("--users", type=int, default=10, help="concurrent candidate sessions")
+    parser.add_argument("--rounds", type=int, default=1, help="sessions per simulated user")
+    parser.add_argument("--questions", type=int, default=3)
+    parser.add_argument("--video-kb", type=int, default=256, help="synthetic webm size per answer")
+    parser.add_argument("--llm-latency-ms", type=float, default=200)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50)
+    parser.add_argument("--report-polls", type=int, default=50)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 regression ratio")
+    parser.add_argument("--min-delta-ms", type=float, default=25, help="ignore p95 changes smaller than this")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="show the app's own log output")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="interview-bench-")
+    os.environ.update({
+        "USERS_DB": os.path.join(workdir, "users.db"),
+        "INTERVIEW_DB_DIR": os.path.join(workdir, "interviews"),
+        # never import (and rename) legacy interview files from the working tree
+        "INTERVIEW_LEGACY_DIR": os.path.join(workdir, "interviews"),
+        "QUESTION_BANK_DB": os.path.join(workdir, "question_bank.db"),
+        "JOBS_DB": os.path.join(workdir, "jobs.db"),
+        "HISTORY_DB": os.path.join(workdir, "history.db"),
+        "UPLOAD_TMP_DIR": os.path.join(workdir, "upload_tmp"),
+        "UPLOAD_DIR": os.path.join(workdir, "uploads"),
+        "MEDIA_GC_DB": os.path.join(workdir, "media_gc.db"),
+        "MEDIA_GC_INTERVAL": "0",
+        # keep ffmpeg re-encodes from competing with the requests being timed
+        "MEDIA_RENDITIONS": "off",
+        "LLM_BACKEND": "http",
+    })
+
+    # The LLM client reads its URL at import time, so pick the port first
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        llm_port = probe.getsockname()[1]
+    os.environ["LLM_HTTP_URL"] = f"http://127.0.0.1:{llm_port}/generate"
+
+    sys.path.insert(0, BENCH_DIR)
+    from fake_llm_server import start_server
+    llm_server, _ = start_server(llm_port, args.llm_latency_ms, args.llm_jitter_ms)
+
+    sys.path.insert(0, BACKEND_DIR)
+    os.chdir(BACKEND_DIR)
+    from werkzeug.serving import make_server
+    from app import create_app
+    flask_app = create_app()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    recorder = Recorder()
+    video_bytes = args.video_kb * 1024
+
+    def user_loop(user_no):
+        for r in range(args.rounds):
+            run_session(base_url, recorder, user_no * args.rounds + r, args.questions, video_bytes,
+                        args.report_polls)
+
+    # The app logs with print(); keep that out of the report unless asked for
+    app_output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    with app_output:
+        started = time.perf_counter()
+        threads = [threading.Thread(target=user_loop, args=(u,)) for u in range(args.users)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - started
+
+    server.shutdown()
+    llm_server.shutdown()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = summarize(recorder, wall)
+    summary["config"] = {k: v for k, v in vars(args).items() if k not in ("save_baseline", "verbose", "tolerance", "min_delta_ms")}
+    print_table(summary)
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(os.path.join(RESULTS_DIR, "latest.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+
+    if args.save_baseline:
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"Saved baseline to {BASELINE_FILE}")
+        return 0
+
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != summary["config"]:
+            print("NOTE: baseline was recorded with a different configuration; comparison is indicative only")
+        regressions = compare(summary, baseline, args.tolerance, args.min_delta_ms)
+        for route, before, after in regressions:
+            print(f"REGRESSION: {route} p95 {before} ms -> {after} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
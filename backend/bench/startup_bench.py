@@ -0,0 +1,87 @@
+# backend/bench/startup_bench.py
+"""
+Cold-start benchmark.
+
+Starts fresh interpreters and times, in each:
+
+    import app -> create_app() -> first GET /login -> first LLM client
+
+``--mode lazy`` is the current code. ``--mode eager`` imports the Gemini SDK
+before anything else, which is what every worker paid when it was imported
+at module level, so the two columns compare before/after.
+
+    cd backend
+    python bench/startup_bench.py --runs 5
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+import statistics
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CHILD = r"""
+import os, sys, time, json
+t0 = time.perf_counter()
+if os.environ.get("BENCH_EAGER_SDK") == "1":
+    import google.generativeai
+sys.path.insert(0, os.getcwd())
+import app as app_module
+t1 = time.perf_counter()
+flask_app = app_module.create_app({"START_BACKGROUND_TASKS": False, "SECRET_KEY": "bench"})
+t2 = time.perf_counter()
+flask_app.test_client().get("/login")
+t3 = time.perf_counter()
+from services.llm_client import get_llm_client
+get_llm_client()
+t4 = time.perf_counter()
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "create_app_ms": (t2 - t1) * 1000,
+                  "first_request_ms": (t3 - t0) * 1000, "first_llm_client_ms": (t4 - t3) * 1000}))
+"""
+
+STEPS = ("import_ms", "create_app_ms", "first_request_ms", "first_llm_client_ms")
+
+
+def run_child(eager, workdir):
+    env = dict(os.environ)
+    env.update({
+        "BENCH_EAGER_SDK": "1" if eager else "0",
+        "USERS_DB": os.path.join(workdir, "users.db"),
+        "INTERVIEW_DB_DIR": os.path.join(workdir, "interviews"),
+        "JOBS_DB": os.path.join(workdir, "jobs.db"),
+        "QUESTION_BANK_DB": os.path.join(workdir, "question_bank.db"),
+        # build the real Gemini backend (no network call is made)
+        "LLM_BACKEND": "gemini",
+        "GEMINI_API_KEY": env.get("GEMINI_API_KEY") or "bench-placeholder",
+        "PYTHONWARNINGS": "ignore",
+    })
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=BACKEND_DIR, env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Worker cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--mode", choices=("both", "lazy", "eager"), default="both")
+    args = parser.parse_args(argv)
+
+    modes = ("eager", "lazy") if args.mode == "both" else (args.mode,)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as workdir:
+        for mode in modes:
+            runs = [run_child(mode == "eager", workdir) for _ in range(args.runs)]
+            results[mode] = {step: statistics.median(r[step] for r in runs) for step in STEPS}
+
+    print(f"median of {args.runs} fresh interpreters (ms)")
+    print(f"{'step':<22}" + "".join(f"{m:>10}" for m in modes))
+    for step in STEPS:
+        print(f"{step:<22}" + "".join(f"{results[m][step]:>10.1f}" for m in modes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
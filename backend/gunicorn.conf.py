@@ -0,0 +1,36 @@
+# backend/gunicorn.conf.py
+"""
+Pre-fork server settings: ``gunicorn -c gunicorn.conf.py wsgi:app``.
+
+Each worker is a separate process with a few threads. preload_app stays off
+so every worker imports wsgi.py and builds its own app after the fork; the
+LLM client, SQLite connections and job pools are never shared between
+processes. Sessions work across workers because they all load the same
+SECRET_KEY (or SECRET_KEY_FILE).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+# CPU-bound work (password hashing, transcription) runs in the workers, so
+# default to one process per core plus one; threads cover LLM/network waits.
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() + 1)))
+threads = int(os.getenv("WEB_THREADS", "8"))
+worker_class = "gthread"
+# question streams and report evaluations wait on the LLM
+timeout = int(os.getenv("WEB_TIMEOUT", "120"))
+graceful_timeout = 30
+keepalive = 5
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+preload_app = False
+accesslog = os.getenv("ACCESS_LOG", "-")
+# load the LLM SDK and open databases in the background as each worker starts
+warm_up_workers = os.getenv("WEB_WARM_UP", "1") == "1"
+
+
+def post_worker_init(worker):
+    if warm_up_workers:
+        import threading
+        from app import warm_up
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
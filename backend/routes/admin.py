@@ -0,0 +1,53 @@
+# backend/routes/admin.py
+import hmac
+from datetime import datetime
+from flask import Blueprint, current_app, request, session, jsonify, Response, stream_with_context, abort
+from services.export import iter_records, stream, ExportError
+
+admin_bp = Blueprint("admin", __name__)
+
+EXPORT_MIMETYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _is_admin() -> bool:
+    """Bearer ADMIN_TOKEN (scripts) or a logged-in user listed in ADMIN_EMAILS."""
+    token = current_app.config.get("ADMIN_TOKEN")
+    header = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(header.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+        return True
+    admins = {e.strip().lower() for e in (current_app.config.get("ADMIN_EMAILS") or "").split(",") if e.strip()}
+    user = session.get("user")
+    return bool(user and user.get("email", "").lower() in admins)
+
+
+@admin_bp.route("/admin/export", methods=["GET"])
+def export():
+    """
+    Stream every saved answer with its rating as NDJSON (default) or CSV.
+
+    Filters: ``since``/``until`` (ISO dates on created_at), ``role`` and
+    ``difficulty``. Rows are generated while the response is sent, so the
+    worker's memory does not grow with the data.
+    """
+    if not _is_admin():
+        abort(404)
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_MIMETYPES:
+        return jsonify({"ok": False, "error": "format must be ndjson or csv (Parquet: python -m services.export)"}), 400
+
+    records = iter_records(
+        since=request.args.get("since") or None,
+        until=request.args.get("until") or None,
+        role=request.args.get("role") or None,
+        difficulty=request.args.get("difficulty") or None,
+    )
+    try:
+        body = stream(fmt, records)
+    except ExportError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    filename = f"interview-answers-{datetime.utcnow():%Y%m%d}.{fmt}"
+    return Response(stream_with_context(body), mimetype=EXPORT_MIMETYPES[fmt], headers={
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",
+    })
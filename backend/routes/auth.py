@@ -1,6 +1,9 @@
 # backend/routes/auth.py
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from services.user_service import add_user, is_valid_password, verify_user, find_user_by_email
+from services.passwords import HasherBusy
+
+BUSY_MESSAGE = "We're handling a lot of sign-ins right now. Please try again in a few seconds."
 
 auth_bp = Blueprint("auth", __name__)
 
@@ -23,7 +26,15 @@ def signup():
             flash("Email already exists!", "danger")
             return redirect(url_for("auth.signup"))
 
-        add_user(name, email, password)
+        try:
+            added = add_user(name, email, password)
+        except HasherBusy:
+            flash(BUSY_MESSAGE, "warning")
+            return render_template("signup.html"), 503, {"Retry-After": "5"}
+        if not added:
+            # lost a race with a concurrent signup for the same email
+            flash("Email already exists!", "danger")
+            return redirect(url_for("auth.signup"))
         flash("Signup successful! Please login.", "success")
         return redirect(url_for("auth.login"))
 
@@ -36,7 +47,11 @@ def login():
         email = request.form.get("email")
         password = request.form.get("password")
 
-        user = verify_user(email, password)
+        try:
+            user = verify_user(email, password)
+        except HasherBusy:
+            flash(BUSY_MESSAGE, "warning")
+            return render_template("login.html"), 503, {"Retry-After": "5"}
         if user:
             session["user"] = {"name": user["name"], "email": user["email"]}
             flash("Logged in successfully.", "success")
@@ -0,0 +1,41 @@
+# backend/routes/history.py
+import os
+from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
+from services.history_index import get_history_index
+
+history_bp = Blueprint("history", __name__)
+
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+HISTORY_MAX_PAGE_SIZE = 100
+
+
+def _page_args():
+    try:
+        limit = int(request.args.get("limit", HISTORY_PAGE_SIZE))
+    except ValueError:
+        limit = HISTORY_PAGE_SIZE
+    return max(1, min(limit, HISTORY_MAX_PAGE_SIZE)), request.args.get("cursor")
+
+
+@history_bp.route("/history")
+def history():
+    if "user" not in session:
+        flash("Please login first", "danger")
+        return redirect(url_for("auth.login"))
+
+    limit, cursor = _page_args()
+    items, next_cursor = get_history_index().page(session["user"]["email"], limit, cursor)
+    return render_template("history.html", items=items, next_cursor=next_cursor, limit=limit,
+                           first_page=not cursor)
+
+
+@history_bp.route("/api/interviews")
+def history_api():
+    if "user" not in session:
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    limit, cursor = _page_args()
+    items, next_cursor = get_history_index().page(session["user"]["email"], limit, cursor)
+    for item in items:
+        item["report_url"] = url_for("interview.interview_report", id=item["interview_id"])
+    return jsonify({"ok": True, "items": items, "next_cursor": next_cursor})
@@ -1,39 +1,86 @@
 # backend/routes/interview.py
 
-from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify
-import google.generativeai as genai
+from flask import Blueprint, render_template, request, session, redirect, url_for, flash, jsonify, Response, stream_with_context, send_file, abort
 from uuid import uuid4
 import json
 import os
+import posixpath
 import re
+import time
 from datetime import datetime
 from dotenv import load_dotenv
+from services.interview_store import get_interview_store, InterviewNotFound
+from services import upload_service
+from services.upload_service import UploadError
+from services.question_bank import get_question_bank
+from services.jobs import get_job_queue
+from services.evaluation import score_answer_job, score_job_key, summarize, evaluation_key
+from services.eval_schema import valid_score, mean_rating
+from services.llm_client import get_llm_client
+from services.transcription import get_transcriber, transcribe_answer_job, transcribe_job_key, TRANSCRIBE_PROCESSES
+from services.history_index import get_history_index
+from services.media_worker import get_media_processor, process_media_job, media_job_key, MEDIA_PROCESSES
+from services.metrics import CACHE_LOOKUPS, LLM_FALLBACKS, QUESTION_TTFQ_SECONDS, UPLOAD_BYTES, UPLOAD_DUPLICATES, UPLOAD_SIZE, UPLOAD_WRITE_SECONDS
 
 # Load .env file for API key
 load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 interview_bp = Blueprint("interview", __name__)
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-UPLOAD_DIR = os.path.join(BASE_DIR, "frontend", "static", "uploads")
-DATA_DIR = os.path.join(BASE_DIR, "backend", "data", "interviews")
+# Video URLs carry the answer's rev, so a matching response never changes
+VIDEO_CACHE_SECONDS = int(os.getenv("VIDEO_CACHE_SECONDS", str(365 * 24 * 3600)))
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(DATA_DIR, exist_ok=True)
+def _load_state(interview_id: str) -> dict:
+    return get_interview_store().load(interview_id)
 
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
+def _save_state(interview_id: str, state: dict) -> None:
+    get_interview_store().save(interview_id, state)
 
-def _state_path(interview_id: str) -> str:
-    return os.path.join(DATA_DIR, f"{interview_id}.json")
+def _create_interview(state: dict) -> None:
+    """Persist a new interview and list it in its owner's history."""
+    index = get_history_index()
+    _save_state(state["id"], state)
+    index.add(state["owner"], state)
 
-def _load_state(interview_id: str) -> dict:
-    with open(_state_path(interview_id), "r", encoding="utf-8") as f:
-        return json.load(f)
+def _question_prompt(name, role, description, difficulty, num_questions, pool) -> str:
+    return f"""
+You are an expert interviewer.
+Generate exactly {pool} unique and challenging interview questions for the role: {role}.
+Candidate name: {name}
+Job Description: {description}
+Difficulty: {difficulty}
 
-def _save_state(interview_id: str, state: dict) -> None:
-    with open(_state_path(interview_id), "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+STRICT FORMAT:
+- First line: "Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty)."
+- Then, list each question on a new line, numbered ("1. ...", "2. ...", ...).
+- No extra commentary, no answers, no explanations, only questions.
+- Maximum clarity, one question per line.
+
+Example output:
+Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty).
+1. <Question 1>
+2. <Question 2>
+...
+"""
+
+def _mock_question(role, i) -> str:
+    return f"{i+1}. Sample {role} question #{i+1}"
+
+def _new_state(interview_id, owner, name, role, difficulty, num, intro, questions) -> dict:
+    return {
+        "id": interview_id,
+        "owner": owner,
+        "created_at": datetime.utcnow().isoformat() + "Z",
+        "candidate": name,
+        "role": role,
+        "difficulty": difficulty,
+        "num_questions": num,
+        "intro": intro,
+        "questions": questions,
+        "answers": []
+    }
+
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 @interview_bp.route("/interview", methods=["GET", "POST"])
 def interview():
@@ -62,67 +109,48 @@ def interview():
                 done=False
             )
 
-        prompt = f"""
-You are an expert interviewer.
-Generate exactly {num_questions} unique and challenging interview questions for the role: {role}.
-Candidate name: {name}
-Job Description: {description}
-Difficulty: {difficulty}
-
-STRICT FORMAT:
-- First line: "Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty)."
-- Then, list each question on a new line, numbered ("1. ...", "2. ...", ...).
-- No extra commentary, no answers, no explanations, only questions.
-- Maximum clarity, one question per line.
-
-Example output:
-Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty).
-1. <Question 1>
-2. <Question 2>
-...
-"""
+        try:
+            num = int(num_questions)
+        except ValueError:
+            flash("Number of questions must be a whole number", "danger")
+            return render_template("interview.html", name=name, done=False)
+        bank = get_question_bank()
+        pool = bank.pool_size(num)
+        prompt = _question_prompt(name, role, description, difficulty, num_questions, pool)
 
         try:
-            # Call Gemini API
-            lines = []
-            if GEMINI_API_KEY:
-                model = genai.GenerativeModel("gemini-2.0-flash")
-                response = model.generate_content(prompt)
-                raw_text = response.text.strip() if response.text else ""
-                print("DEBUG: Gemini response:", repr(raw_text))
-                if raw_text:
-                    lines = [line.strip() for line in raw_text.split("\n") if line.strip()]
+            interview_id = uuid4().hex
+            default_intro = f"Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty)."
+            llm = get_llm_client()
+            questions = bank.get(role, difficulty, description, num, seed=interview_id, model=llm.model_name)
+
+            if questions:
+                intro = default_intro
             else:
-                print("DEBUG: No API key found, using mock questions")
-                lines = [
-                    f"Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty)."
-                ] + [f"{i+1}. Sample {role} question #{i+1}" for i in range(int(num_questions))]
-
-            # Validate and clean output
-            if not lines or len(lines) < int(num_questions) + 1:
-                print("DEBUG: Gemini output incomplete, falling back to mock questions")
-                lines = [
-                    f"Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty)."
-                ] + [f"{i+1}. Sample {role} question #{i+1}" for i in range(int(num_questions))]
-
-            intro = lines[0]
-            # Only keep lines starting with a number and dot (e.g., "1. ...")
-            questions = [line for line in lines[1:] if re.match(r'^\d+\.\s*', line)]
+                # Call the LLM
+                raw_text = llm.generate(prompt, kind="questions", context={
+                    "name": name, "role": role, "difficulty": difficulty,
+                    "num_questions": num_questions, "pool": pool
+                })
+                lines = [line.strip() for line in raw_text.split("\n") if line.strip()]
+                from_llm = True
+
+                # Validate and clean output
+                if not lines or len(lines) < num + 1:
+                    LLM_FALLBACKS.inc(kind="questions")
+                    lines = [default_intro] + [_mock_question(role, i) for i in range(num)]
+                    from_llm = False
+
+                intro = lines[0]
+                # Only keep lines starting with a number and dot (e.g., "1. ...")
+                generated = [line for line in lines[1:] if re.match(r'^\d+\.\s*', line)]
+                if from_llm:
+                    bank.put(role, difficulty, description, num, generated, model=llm.model_name)
+                questions = bank.select(generated, num, seed=interview_id)
             print("DEBUG: Final questions parsed for frontend:", questions)
 
-            interview_id = uuid4().hex
-            state = {
-                "id": interview_id,
-                "created_at": datetime.utcnow().isoformat() + "Z",
-                "candidate": name,
-                "role": role,
-                "difficulty": difficulty,
-                "num_questions": int(num_questions),
-                "intro": intro,
-                "questions": questions,
-                "answers": []
-            }
-            _save_state(interview_id, state)
+            state = _new_state(interview_id, session["user"]["email"], name, role, difficulty, num, intro, questions)
+            _create_interview(state)
             session["interview_id"] = interview_id
 
             return render_template(
@@ -131,14 +159,14 @@ Here goes your questions, {name}, for the {role} role ({num_questions} questions
                 interview_id=interview_id,
                 role=role,
                 difficulty=difficulty,
-                num_questions=int(num_questions),
+                num_questions=num,
                 intro=intro,
                 questions=questions,
                 done=True
             )
 
         except Exception as e:
-            print("ERROR: Gemini API or parsing failed:", e)
+            print("ERROR: LLM call or parsing failed:", e)
             flash(f"AI service error: {e}", "danger")
             return render_template(
                 "interview.html",
@@ -154,47 +182,364 @@ Here goes your questions, {name}, for the {role} role ({num_questions} questions
     return render_template("interview.html", name=name, done=False)
 
 
+@interview_bp.route("/interview/stream", methods=["POST"])
+def interview_stream():
+    """
+    Same inputs as POST /interview, but answers with Server-Sent Events:
+    ``interview`` (id and intro), one ``question`` per parsed line as soon
+    as the model emits it, then ``done`` with the final list and the
+    time-to-first-question in milliseconds.
+    """
+    if "user" not in session:
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    name = session["user"]["name"]
+    role = request.form.get("role")
+    description = request.form.get("description")
+    difficulty = request.form.get("difficulty")
+    num_questions = request.form.get("num_questions")
+    if not role or not description or not difficulty or not num_questions:
+        return jsonify({"ok": False, "error": "Please fill in all fields"}), 400
+    try:
+        num = int(num_questions)
+    except ValueError:
+        return jsonify({"ok": False, "error": "Number of questions must be a whole number"}), 400
+
+    started = time.monotonic()
+    bank = get_question_bank()
+    llm = get_llm_client()
+    pool = bank.pool_size(num)
+    interview_id = uuid4().hex
+    intro = f"Here goes your questions, {name}, for the {role} role ({num_questions} questions, {difficulty} difficulty)."
+
+    # Create the interview up front so answers can be saved mid-stream
+    _create_interview(_new_state(interview_id, session["user"]["email"], name, role, difficulty, num, intro, []))
+    session["interview_id"] = interview_id
+
+    def events():
+        questions = []
+        generated = []
+        ttfq_ms = None
+        from_llm = False
+        current_intro = intro
+        try:
+            yield _sse("interview", {"interview_id": interview_id, "intro": intro, "role": role,
+                                     "difficulty": difficulty, "num_questions": num})
+            try:
+                cached = bank.get(role, difficulty, description, num, seed=interview_id, model=llm.model_name)
+                if cached:
+                    lines = iter(cached)
+                else:
+                    prompt = _question_prompt(name, role, description, difficulty, num_questions, pool)
+                    lines = _iter_lines(llm.stream(prompt, kind="questions", context={
+                        "name": name, "role": role, "difficulty": difficulty,
+                        "num_questions": num_questions, "pool": pool
+                    }))
+                    from_llm = True
+                for line in lines:
+                    if not re.match(r'^\d+\.\s*', line):
+                        if not questions and not generated:
+                            current_intro = line
+                            yield _sse("intro", {"intro": line})
+                        continue
+                    generated.append(line)
+                    if len(questions) >= num:
+                        continue  # rest of a larger pool: bank it, don't show it
+                    questions.append(line)
+                    if ttfq_ms is None:
+                        ttfq_ms = round((time.monotonic() - started) * 1000, 1)
+                    yield _sse("question", {"index": len(questions) - 1, "text": line})
+            except Exception as e:
+                print("ERROR: LLM stream failed:", e)
+                from_llm = False
+                yield _sse("error", {"error": "Question generation was interrupted; using sample questions."})
+
+            # Fill any gap the model left with mock questions, as the non-streaming path does
+            if len(questions) < num:
+                from_llm = False
+                LLM_FALLBACKS.inc(kind="questions")
+                for i in range(len(questions), num):
+                    questions.append(_mock_question(role, i))
+                    if ttfq_ms is None:
+                        ttfq_ms = round((time.monotonic() - started) * 1000, 1)
+                    yield _sse("question", {"index": i, "text": questions[i]})
+        finally:
+            get_interview_store().update(interview_id, intro=current_intro, questions=questions, ttfq_ms=ttfq_ms)
+            if from_llm:
+                bank.put(role, difficulty, description, num, generated, model=llm.model_name)
+        if ttfq_ms is not None:
+            QUESTION_TTFQ_SECONDS.observe(ttfq_ms / 1000.0)
+        yield _sse("done", {"interview_id": interview_id, "questions": questions, "ttfq_ms": ttfq_ms})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _iter_lines(chunks):
+    """Re-split streamed text chunks into complete, stripped, non-empty lines."""
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        while "\n" in buffer:
+            line, buffer = buffer.split("\n", 1)
+            if line.strip():
+                yield line.strip()
+    if buffer.strip():
+        yield buffer.strip()
+
+
+@interview_bp.route("/interview/upload/start", methods=["POST"])
+def upload_start():
+    if "user" not in session:
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    interview_id = request.form.get("interview_id")
+    q_index = _int_field(request.form.get("q_index"))
+    if q_index is None:
+        return jsonify({"ok": False, "error": "q_index must be a whole number"}), 400
+    if not interview_id or q_index < 0:
+        return jsonify({"ok": False, "error": "Missing fields"}), 400
+    try:
+        state = _load_state(interview_id)
+    except InterviewNotFound:
+        return jsonify({"ok": False, "error": "Unknown interview"}), 404
+    if not _owns_interview(state, interview_id):
+        return jsonify({"ok": False, "error": "Unknown interview"}), 404
+
+    upload = upload_service.start_upload(session["user"]["email"], interview_id, q_index)
+    return jsonify({"ok": True, **upload})
+
+
+@interview_bp.route("/interview/upload/<upload_id>", methods=["GET", "PUT"])
+def upload_chunk(upload_id):
+    """GET reports the acknowledged offset; PUT appends a raw chunk at ``?offset=``."""
+    if "user" not in session:
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
+
+    owner = session["user"]["email"]
+    try:
+        if request.method == "GET":
+            return jsonify({"ok": True, **upload_service.upload_status(upload_id, owner)})
+        offset = _int_field(request.args.get("offset"))
+        if offset is None:
+            return jsonify({"ok": False, "error": "offset must be a whole number"}), 400
+        with UPLOAD_WRITE_SECONDS.time(mode="chunked"):
+            new_offset = upload_service.append_chunk(upload_id, owner, offset, request.stream)
+        UPLOAD_BYTES.inc(new_offset - offset, mode="chunked")
+    except UploadError as e:
+        return jsonify({"ok": False, "error": str(e), "offset": e.offset}), e.status
+    return jsonify({"ok": True, "upload_id": upload_id, "offset": new_offset})
+
+
 @interview_bp.route("/interview/save_answer", methods=["POST"])
 def save_answer():
     if "user" not in session:
         return jsonify({"ok": False, "error": "Unauthorized"}), 401
 
     interview_id = request.form.get("interview_id")
-    q_index = int(request.form.get("q_index", -1))
+    q_index = _int_field(request.form.get("q_index"))
+    if q_index is None:
+        return jsonify({"ok": False, "error": "q_index must be a whole number"}), 400
     question = request.form.get("question", "")
     transcript = request.form.get("transcript", "").strip()
+    upload_id = request.form.get("upload_id")
+    # set once per recording by the browser's upload queue, so retries can be recognised
+    client_upload_id = request.form.get("client_upload_id", "").strip()[:64] or None
     file = request.files.get("video")
 
-    if not interview_id or q_index < 0 or not question or not file:
+    if not interview_id or q_index < 0 or not question or not (file or upload_id):
         return jsonify({"ok": False, "error": "Missing fields"}), 400
 
-    # Save video
-    filename = f"{uuid4().hex}.webm"
-    save_path = os.path.join(UPLOAD_DIR, filename)
-    file.save(save_path)
-
-    video_url = url_for("static", filename=f"uploads/{filename}", _external=False)
-
-    # Update state on disk
-    state = _load_state(interview_id)
-    # ensure one record per index
-    existing = [a for a in state["answers"] if int(a["index"]) == q_index]
-    if existing:
-        existing[0]["question"] = question
-        existing[0]["transcript"] = transcript
-        existing[0]["video_url"] = video_url
+    try:
+        state = _load_state(interview_id)
+    except InterviewNotFound:
+        return jsonify({"ok": False, "error": "Unknown interview"}), 404
+    if not _owns_interview(state, interview_id):
+        return jsonify({"ok": False, "error": "Unknown interview"}), 404
+    if client_upload_id:
+        existing = next((a for a in state["answers"] if int(a["index"]) == q_index), None)
+        if existing and existing.get("client_upload_id") == client_upload_id:
+            # a retry of a save whose response was lost: nothing to write again
+            UPLOAD_DUPLICATES.inc()
+            return jsonify({"ok": True, "duplicate": True, "video_url": _video_url(interview_id, existing),
+                            "saved_count": len(state["answers"]), "score_job_id": None})
+
+    # Save video: either finalize a chunked upload or take the multipart file
+    filename, save_path = upload_service.new_video_path()
+    if upload_id:
+        try:
+            upload_service.finalize_upload(upload_id, session["user"]["email"], interview_id, q_index, save_path)
+        except UploadError as e:
+            return jsonify({"ok": False, "error": str(e)}), e.status
     else:
-        state["answers"].append({
-            "index": q_index,
-            "question": question,
-            "transcript": transcript,
-            "video_url": video_url
-        })
-    _save_state(interview_id, state)
+        with UPLOAD_WRITE_SECONDS.time(mode="multipart"):
+            file.save(save_path)
+        UPLOAD_BYTES.inc(os.path.getsize(save_path), mode="multipart")
+    UPLOAD_SIZE.observe(os.path.getsize(save_path))
+
+    # Upsert just this answer; one record per index
+    rev = uuid4().hex
+    video_url = url_for("interview.answer_video", interview_id=interview_id, q_index=q_index, v=rev)
+    transcribe = get_transcriber().enabled
+    answer = {
+        "index": q_index,
+        "question": question,
+        "transcript": transcript,
+        "browser_transcript": transcript,
+        "transcript_source": "browser",
+        "video_file": filename,
+        "video_url": video_url,
+        "rev": rev,
+        "client_upload_id": client_upload_id
+    }
+    if transcribe:
+        answer["transcription"] = "pending"
+    media = get_media_processor().enabled
+    if media:
+        answer["media_status"] = "pending"
+    try:
+        saved_count, stored = get_interview_store().save_answer_once(interview_id, answer)
+    except InterviewNotFound:
+        return jsonify({"ok": False, "error": "Unknown interview"}), 404
+    if stored is not answer:
+        # a concurrent retry of the same upload won the race; drop our copy
+        UPLOAD_DUPLICATES.inc()
+        try:
+            os.remove(save_path)
+        except OSError:
+            pass
+        return jsonify({"ok": True, "duplicate": True, "video_url": _video_url(interview_id, stored),
+                        "saved_count": saved_count, "score_job_id": None})
+
+    # Score this answer now so the report only has to summarize; with
+    # server transcription on, the transcribe job scores it when done
+    job_id = _submit_answer_job(interview_id, answer)
+    if media:
+        # smaller rendition, poster and preview for the report page
+        get_job_queue("media", workers=MEDIA_PROCESSES).submit(
+            "media", process_media_job, interview_id, q_index, rev,
+            dedupe_key=media_job_key(interview_id, q_index, rev)
+        )
+
+    return jsonify({"ok": True, "video_url": video_url, "saved_count": saved_count, "score_job_id": job_id})
+
+
+@interview_bp.route("/interview/jobs/<job_id>", methods=["GET"])
+def job_status(job_id):
+    if "user" not in session:
+        return jsonify({"ok": False, "error": "Unauthorized"}), 401
 
-    return jsonify({"ok": True, "video_url": video_url, "saved_count": len(state["answers"])})
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "error": "Unknown job"}), 404
+    return jsonify({"ok": True, "id": job["id"], "status": job["status"], "error": job["error"]})
+
+
+def _submit_answer_job(interview_id: str, answer: dict) -> str:
+    index, rev = int(answer["index"]), answer.get("rev")
+    if answer.get("transcription") == "pending":
+        return get_job_queue("transcribe", workers=TRANSCRIBE_PROCESSES).submit(
+            "transcribe", transcribe_answer_job, interview_id, index, rev,
+            dedupe_key=transcribe_job_key(interview_id, index, rev)
+        )
+    return get_job_queue().submit(
+        "score", score_answer_job, interview_id, index, rev,
+        dedupe_key=score_job_key(interview_id, index, rev)
+    )
 
 
+def _int_field(value, default=-1):
+    """Client-supplied integer, ``default`` when absent, None when not a number."""
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _owns_interview(state: dict, interview_id: str) -> bool:
+    owner = state.get("owner")
+    if owner:
+        return owner == session["user"]["email"]
+    # interviews created before owners were recorded: only the session that ran it
+    return session.get("interview_id") == interview_id
+
+
+def _video_url(interview_id: str, answer: dict, variant: str = None) -> str:
+    return url_for("interview.answer_video", interview_id=interview_id,
+                   q_index=int(answer["index"]), variant=variant, v=answer.get("rev"))
+
+
+def _media_urls(interview_id: str, answer: dict) -> dict:
+    """Poster/preview URLs, and the smallest full video available (None once evicted)."""
+    if not upload_service.video_path(answer):
+        return {"video_url": None, "poster_url": None, "preview_url": None}
+    has = {v: upload_service.derived_path(answer, v) is not None for v in upload_service.DERIVED_SUFFIXES}
+    return {
+        "video_url": _video_url(interview_id, answer, "rendition" if has["rendition"] else None),
+        "poster_url": _video_url(interview_id, answer, "poster") if has["poster"] else None,
+        "preview_url": _video_url(interview_id, answer, "preview") if has["preview"] else None,
+    }
+
+
+@interview_bp.before_app_request
+def _block_static_uploads():
+    # recordings written by older builds under static/uploads must go through answer_video
+    if request.endpoint == "static":
+        filename = posixpath.normpath((request.view_args or {}).get("filename", ""))
+        if filename == "uploads" or filename.startswith("uploads/"):
+            abort(404)
+
+
+@interview_bp.route("/interview/<interview_id>/video/<int:q_index>", methods=["GET"])
+@interview_bp.route("/interview/<interview_id>/video/<int:q_index>/<variant>", methods=["GET"])
+def answer_video(interview_id, q_index, variant=None):
+    """
+    Stream a recorded answer to its owner.
+
+    ``variant`` picks a file made by the media worker (rendition, preview or
+    poster) instead of the original upload.
+
+    Range requests get 206 partial responses, the strong ETag lets If-Range
+    resumes and revalidation work, and full responses go out through the
+    server's file wrapper (sendfile where available). URLs carrying the
+    current ``?v=<rev>`` are cached for a year; anything else revalidates.
+    """
+    if "user" not in session:
+        abort(401)
+    try:
+        state = _load_state(interview_id)
+    except InterviewNotFound:
+        abort(404)
+    if not _owns_interview(state, interview_id):
+        abort(404)
+
+    if variant is not None and variant not in upload_service.DERIVED_SUFFIXES:
+        abort(404)
+    answer = next((a for a in state["answers"] if int(a["index"]) == q_index), None)
+    if answer is None:
+        abort(404)
+    path = upload_service.derived_path(answer, variant) if variant else upload_service.video_path(answer)
+    if path is None:
+        abort(404)
+
+    stat = os.stat(path)
+    etag = f"{os.path.basename(path).split('.')[0]}-{variant or 'original'}-{stat.st_size:x}"
+    current = bool(answer.get("rev")) and request.args.get("v") == answer.get("rev")
+    mimetype = upload_service.DERIVED_MIMETYPES[variant] if variant else "video/webm"
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=etag,
+                         max_age=VIDEO_CACHE_SECONDS if current else 0)
+    response.cache_control.public = False
+    response.cache_control.private = True
+    if current:
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
 
 
 @interview_bp.route("/interview/report", methods=["GET"])
@@ -203,84 +548,71 @@ def interview_report():
         flash("Please login first", "danger")
         return redirect(url_for("auth.login"))
 
-    interview_id = session.get("interview_id")
+    # ?id= opens a past interview from the history page
+    interview_id = request.args.get("id") or session.get("interview_id")
     if not interview_id:
         flash("No interview in progress.", "warning")
         return redirect(url_for("interview.interview"))
 
-    state = _load_state(interview_id)
+    try:
+        state = _load_state(interview_id)
+    except InterviewNotFound:
+        state = None
+    if state is None or not _owns_interview(state, interview_id):
+        if interview_id == session.get("interview_id"):
+            session.pop("interview_id", None)
+        flash("Interview not found.", "warning")
+        return redirect(url_for("interview.interview"))
+    session["interview_id"] = interview_id
     name = state["candidate"]
     role = state["role"]
     difficulty = state["difficulty"]
     answers = sorted(state["answers"], key=lambda a: int(a["index"]))
-
-    # Build evaluation prompt
-    qa_list = [{"index": a["index"], "question": a["question"], "answer": a.get("transcript", "")} for a in answers]
-
-    eval_prompt = f"""
-You are an interview evaluator. Rate the candidate's answers concisely.
-
-Candidate: {name}
-Role: {role}
-Difficulty: {difficulty}
-
-Here are the questions and the candidate's transcripts as JSON:
-{json.dumps(qa_list, ensure_ascii=False, indent=2)}
-
-Return STRICT JSON with this exact structure (no extra text):
-{{
-  "overall_summary": "<2-4 sentence overview>",
-  "overall_rating": <float 0-5>,
-  "skills": [
-    {{"name": "Communication", "rating": <0-5>, "note": "<one sentence>"}},
-    {{"name": "Problem Solving", "rating": <0-5>, "note": "<one sentence>"}}
-  ],
-  "per_question": [
-    {{
-      "index": <int>,
-      "rating": <0-5>,
-      "strengths": "<one sentence>",
-      "improvements": "<one sentence>"
-    }}
-  ]
-}}
-"""
-
-    evaluation = None
+    for a in answers:
+        # None once the sweeper has evicted the recording
+        a.update(_media_urls(interview_id, a))
+
+    # Answers are scored in the background as they are saved; re-request only
+    # the ones whose score is missing or malformed and poll until they finish.
+    scores = {int(a["index"]): valid_score(a.get("score"), a["index"]) for a in answers}
+    per_question = [scores[int(a["index"])] for a in answers if scores[int(a["index"])]]
+    unscored = [a for a in answers if not scores[int(a["index"])]]
+    if unscored and not request.args.get("partial"):
+        job_ids = [_submit_answer_job(interview_id, a) for a in unscored]
+        return render_template(
+            "report.html",
+            name=name,
+            role=role,
+            difficulty=difficulty,
+            answers=answers,
+            evaluation=None,
+            raw_text=None,
+            pending_jobs=job_ids
+        )
+
+    # Reuse the stored evaluation while the answers it was made from are unchanged
+    key = evaluation_key(answers, get_llm_client().model_name)
+    evaluation = state.get("evaluation") if state.get("evaluation_key") == key else None
     raw_text = None
-    try:
-        if GEMINI_API_KEY:
-            model = genai.GenerativeModel("gemini-2.0-flash")
-            resp = model.generate_content(eval_prompt)
-            raw_text = (resp.text or "").strip()
-        else:
-            # Fallback mock
-            raw_text = json.dumps({
-                "overall_summary": "Solid communication with room for deeper specifics.",
-                "overall_rating": 3.8,
-                "skills": [
-                    {"name": "Communication", "rating": 4.0, "note": "Clear and structured."},
-                    {"name": "Problem Solving", "rating": 3.5, "note": "Reasonable approach, could justify trade-offs more."}
-                ],
-                "per_question": [
-                    {"index": a["index"], "rating": 3.5, "strengths": "Answered confidently.", "improvements": "Add concrete examples."}
-                    for a in answers
-                ]
-            }, indent=2)
-
-        # Try parsing JSON (robust)
+    CACHE_LOOKUPS.inc(cache="evaluation", result="hit" if evaluation else "miss")
+    if evaluation is None:
         try:
-            evaluation = json.loads(raw_text)
-        except Exception:
-            # Try to extract the first {...} block
-            start = raw_text.find("{")
-            end = raw_text.rfind("}")
-            if start != -1 and end != -1:
-                evaluation = json.loads(raw_text[start:end+1])
-            else:
-                evaluation = None
-    except Exception as e:
-        flash(f"AI evaluation error: {e}", "danger")
+            evaluation, raw_text = summarize(name, role, difficulty,
+                                             [a for a in answers if scores[int(a["index"])]], per_question)
+        except Exception as e:
+            flash(f"AI evaluation error: {e}", "danger")
+        if evaluation is not None:
+            get_interview_store().update(interview_id, evaluation=evaluation, evaluation_key=key)
+            get_history_index().set_rating(interview_id, evaluation.get("overall_rating"))
+        elif per_question:
+            # keep the per-question ratings on screen; not cached, so the summary is retried next time
+            evaluation = {
+                "overall_summary": "The overall summary could not be generated this time; "
+                                   "per-question ratings are below.",
+                "overall_rating": mean_rating(per_question),
+                "skills": [],
+                "per_question": per_question,
+            }
 
     return render_template(
         "report.html",
@@ -292,3 +624,27 @@ Return STRICT JSON with this exact structure (no extra text):
         raw_text=raw_text
     )
 
+
+
+@interview_bp.route("/interview/report/rescore", methods=["POST"])
+def rescore_report():
+    """Drop the stored scores and evaluation so the report is produced again."""
+    if "user" not in session:
+        flash("Please login first", "danger")
+        return redirect(url_for("auth.login"))
+
+    interview_id = session.get("interview_id")
+    try:
+        state = _load_state(interview_id) if interview_id else None
+    except InterviewNotFound:
+        state = None
+    if state is None or not _owns_interview(state, interview_id):
+        flash("Interview not found.", "warning")
+        return redirect(url_for("interview.interview"))
+
+    store = get_interview_store()
+    for a in state["answers"]:
+        store.update_answer(interview_id, a["index"], expect_rev=a.get("rev"), score=None)
+    store.update(interview_id, evaluation=None, evaluation_key=None)
+    get_history_index().set_rating(interview_id, None)
+    return redirect(url_for("interview.interview_report"))
@@ -1,50 +1,90 @@
 import os
-import google.generativeai as genai
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from services.cache import TTLCache
+from services.llm_client import get_llm_client
+from services.metrics import CACHE_LOOKUPS, LLM_FALLBACKS
+
+GREETING_PROMPT_VERSION = "v1"
+GREETING_CACHE_SIZE = int(os.getenv("GREETING_CACHE_SIZE", "512"))
+GREETING_CACHE_TTL = float(os.getenv("GREETING_CACHE_TTL", str(24 * 3600)))
+# Point this at a shared path so every worker process reuses the same greetings
+GREETING_CACHE_PATH = os.getenv("GREETING_CACHE_PATH")
+
+greeting_cache = TTLCache(GREETING_CACHE_SIZE, GREETING_CACHE_TTL, GREETING_CACHE_PATH)
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="greeting-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+
+def _fallback_greeting(name: str) -> str:
+    return f"Hi {name}! Welcome to your AI-powered interview. When you're ready, click Start Interview."
+
+
+def _fetch_greeting(name: str, tone: str):
+    """Blocking LLM call; returns the greeting or None when the model gives nothing usable."""
+    prompt = f"""
+    You are an AI interview assistant.
+    Write exactly 2 short sentences as a warm, {tone} introduction for a candidate named {name}.
+    - Keep it under 40 words total.
+    - Make it sound like a human interviewer, encouraging and approachable.
+    - Do not include bullet points or formatting, just plain text.
+    """
+
+    text = get_llm_client().generate(prompt, kind="greeting", context={"name": name})
+
+    # Handle empty/invalid responses
+    if not text:
+        return None
+
+    greeting = text.strip()
+    # Ensure it ends with a period or exclamation mark
+    if not greeting.endswith((".", "!", "?")):
+        greeting += "."
+
+    return greeting
+
+
+def _refresh_greeting(key, name: str, tone: str) -> None:
+    try:
+        greeting = _fetch_greeting(name, tone)
+        if greeting:
+            greeting_cache.set(key, greeting)
+    except Exception as e:
+        print("AI service error:", e)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(key)
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 def generate_greeting(name: str, tone: str = "professional") -> str:
     """
     Generate a polished greeting for an interview candidate.
-    
+
+    Greetings are cached per (name, tone, prompt version, model). On a miss the
+    fallback greeting is returned right away and the real one is fetched in
+    the background, so the dashboard never waits on the LLM.
+
     Args:
         name (str): Candidate's name.
         tone (str): Desired tone, e.g., 'professional', 'friendly', 'formal'.
-    
+
     Returns:
         str: A warm, two-line greeting.
     """
-    fallback_greeting = f"Hi {name}! Welcome to your AI-powered interview. When you're ready, click Start Interview."
-
-    if not GEMINI_API_KEY:
-        return fallback_greeting
+    fallback_greeting = _fallback_greeting(name)
 
-    try:
-        model = genai.GenerativeModel("gemini-2.0-flash")
+    key = (name, tone, GREETING_PROMPT_VERSION, get_llm_client().model_name)
+    cached = greeting_cache.get(key)
+    if cached:
+        CACHE_LOOKUPS.inc(cache="greeting", result="hit")
+        return cached
+    CACHE_LOOKUPS.inc(cache="greeting", result="miss")
+    LLM_FALLBACKS.inc(kind="greeting")
 
-        prompt = f"""
-        You are an AI interview assistant.
-        Write exactly 2 short sentences as a warm, {tone} introduction for a candidate named {name}.
-        - Keep it under 40 words total.
-        - Make it sound like a human interviewer, encouraging and approachable.
-        - Do not include bullet points or formatting, just plain text.
-        """
+    with _refreshing_lock:
+        if key not in _refreshing:
+            _refreshing.add(key)
+            _refresh_pool.submit(_refresh_greeting, key, name, tone)
 
-        response = model.generate_content(prompt)
-
-        # Handle empty/invalid responses
-        if not response or not response.text:
-            return fallback_greeting
-
-        greeting = response.text.strip()
-        # Ensure it ends with a period or exclamation mark
-        if not greeting.endswith((".", "!", "?")):
-            greeting += "."
-
-        return greeting
-
-    except Exception as e:
-        print("AI service error:", e)
-        return fallback_greeting
+    return fallback_greeting
@@ -0,0 +1,181 @@
+# backend/services/assets.py
+"""
+Fingerprinted, precompressed static assets.
+
+``python -m services.assets build`` copies every CSS/JS (etc.) file under
+``frontend/static`` to ``frontend/static/dist`` with a content hash in its
+name (``css/style.3f2a9c1b7d0e.css``), writes ``.gz`` and, when the
+``brotli`` package is installed, ``.br`` siblings, and records the mapping
+in ``dist/manifest.json``.
+
+Templates link assets with ``asset_url('css/style.css')``. With a manifest
+that resolves to the hashed file, served with a one-year immutable cache
+and the best precompressed encoding the browser accepts. Without one (a
+fresh checkout) it falls back to the plain static URL, so development
+needs no build step.
+
+    cd backend
+    python -m services.assets build
+"""
+import os
+import sys
+import json
+import gzip
+import hashlib
+import argparse
+import mimetypes
+from flask import request, send_file, url_for, abort
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+STATIC_DIR = os.path.join(os.path.dirname(BASE_DIR), "frontend", "static")
+ASSET_DIST_DIR = os.getenv("ASSET_DIST_DIR", os.path.join(STATIC_DIR, "dist"))
+ASSET_CACHE_SECONDS = int(os.getenv("ASSET_CACHE_SECONDS", str(365 * 24 * 3600)))
+
+# fingerprinted and served from dist/; everything else under static/ is left alone
+ASSET_EXTENSIONS = (".css", ".js", ".mjs", ".svg", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico",
+                    ".woff", ".woff2")
+# worth compressing (images and fonts already are)
+COMPRESSIBLE = (".css", ".js", ".mjs", ".svg", ".json", ".txt", ".html")
+SKIP_DIRS = ("dist", "uploads")
+HASH_LENGTH = 12
+# (Accept-Encoding token, file suffix), most preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _hashed_name(rel_path: str, data: bytes) -> str:
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def _write(path: str, data: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _compressors():
+    compressors = [(".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    try:
+        import brotli
+    except ImportError:
+        print("WARNING: brotli is not installed; only .gz files are written")
+    else:
+        compressors.insert(0, (".br", lambda data: brotli.compress(data, quality=11)))
+    return compressors
+
+
+def build(static_dir=STATIC_DIR, dist_dir=ASSET_DIST_DIR) -> dict:
+    """Fingerprint and precompress every asset; returns the new manifest."""
+    compressors = _compressors()
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root) == os.path.abspath(static_dir):
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for fname in sorted(files):
+            if not fname.lower().endswith(ASSET_EXTENSIONS):
+                continue
+            src = os.path.join(root, fname)
+            rel_path = os.path.relpath(src, static_dir).replace(os.sep, "/")
+            with open(src, "rb") as f:
+                data = f.read()
+            hashed = _hashed_name(rel_path, data)
+            dest = os.path.join(dist_dir, hashed)
+            _write(dest, data)
+            if fname.lower().endswith(COMPRESSIBLE):
+                for suffix, compress in compressors:
+                    packed = compress(data)
+                    if len(packed) < len(data):
+                        _write(dest + suffix, packed)
+            manifest[rel_path] = hashed
+    # the manifest goes last so a running app never points at files not yet written
+    _write(os.path.join(dist_dir, "manifest.json"),
+           json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+    return manifest
+
+
+def load_manifest(dist_dir=ASSET_DIST_DIR) -> dict:
+    try:
+        with open(os.path.join(dist_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        print("WARNING: ignoring unreadable asset manifest:", e)
+        return {}
+
+
+def _accepted_encodings(header: str) -> set:
+    """Encodings in an Accept-Encoding header with a non-zero q value."""
+    accepted = set()
+    for part in (header or "").split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if token and q > 0:
+            accepted.add(token.strip().lower())
+    return accepted
+
+
+def register_assets(app, dist_dir=ASSET_DIST_DIR):
+    """Add the ``asset_url`` template helper and the /static/dist/ route."""
+    manifest = load_manifest(dist_dir)
+    served = set(manifest.values())
+    if manifest:
+        print(f"INFO: serving {len(manifest)} fingerprinted asset(s) from {dist_dir}")
+
+    def asset_url(path: str) -> str:
+        hashed = manifest.get(path)
+        if hashed is None:
+            return url_for("static", filename=path)
+        return url_for("dist_asset", filename=hashed)
+
+    app.jinja_env.globals["asset_url"] = asset_url
+
+    @app.route("/static/dist/<path:filename>", endpoint="dist_asset")
+    def dist_asset(filename):
+        # only names the manifest handed out; everything there is content-addressed
+        if filename not in served:
+            abort(404)
+        path = os.path.join(dist_dir, filename)
+        accepted = _accepted_encodings(request.headers.get("Accept-Encoding"))
+        encoding = None
+        for token, suffix in ENCODINGS:
+            if token in accepted and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, token
+                break
+        # type from the asset's own name, not the .br/.gz file being sent
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = send_file(path, mimetype=mimetype, conditional=True, max_age=ASSET_CACHE_SECONDS)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        return response
+
+    return asset_url
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress static assets")
+    parser.add_argument("command", choices=("build",))
+    parser.add_argument("--static-dir", default=STATIC_DIR)
+    parser.add_argument("--dist-dir", default=ASSET_DIST_DIR)
+    args = parser.parse_args(argv)
+
+    manifest = build(args.static_dir, args.dist_dir)
+    for rel_path, hashed in sorted(manifest.items()):
+        print(f"{rel_path} -> dist/{hashed}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# backend/services/cache.py
+import os
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# expired rows are deleted once every this many disk writes
+DISK_PRUNE_EVERY = 500
+
+
+class DiskCacheBackend:
+    """SQLite-backed key/value store so several worker processes share entries."""
+
+    def __init__(self, path: str, prune_every: int = DISK_PRUNE_EVERY):
+        self.path = path
+        self.prune_every = prune_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        """Return ``(value, expires_at)`` or None if missing/expired."""
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value, expires_at: float) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+        with self._writes_lock:
+            self._writes += 1
+            due = self.prune_every and self._writes % self.prune_every == 0
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and an optional shared disk tier.
+
+    Keys are tuples of JSON-serializable parts; values must be JSON-serializable
+    when a disk backend is configured.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 3600, disk_path: str = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.disk = DiskCacheBackend(disk_path) if disk_path else None
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _disk_key(key) -> str:
+        return json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+        if self.disk is not None:
+            try:
+                found = self.disk.get(self._disk_key(key))
+            except sqlite3.Error as e:
+                print("WARNING: disk cache read failed:", e)
+                found = None
+            if found is not None:
+                self._remember(key, *found)
+                with self._lock:
+                    self.hits += 1
+                return found[0]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value) -> None:
+        expires_at = time.time() + self.ttl
+        self._remember(key, value, expires_at)
+        if self.disk is not None:
+            try:
+                self.disk.set(self._disk_key(key), value, expires_at)
+            except sqlite3.Error as e:
+                print("WARNING: disk cache write failed:", e)
+
+    def _remember(self, key, value, expires_at) -> None:
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -0,0 +1,173 @@
+# backend/services/eval_schema.py
+"""
+Tolerant parsing and schema checks for the evaluator's JSON output.
+
+Models wrap JSON in code fences, add prose around it, leave trailing
+commas, use smart quotes or Python literals, and write ratings as "4/5".
+``extract_json`` repairs those, and the ``validate_*`` functions normalize
+a parsed object to the shape the report template expects or say exactly
+what is wrong with it, so callers can re-ask for just the broken part.
+"""
+import re
+import ast
+import json
+
+RATING_MIN, RATING_MAX = 0.0, 5.0
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.S)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+_RATING = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*(?:/\s*(\d+(?:\.\d+)?))?")
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def _balanced_object(text: str):
+    """The first complete top-level ``{...}`` in ``text``, honoring strings."""
+    start = text.find("{")
+    while start != -1:
+        depth, in_string, escaped = 0, None, False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == in_string:
+                    in_string = None
+            elif ch in "\"'":
+                in_string = ch
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    return text[start:i + 1]
+        start = text.find("{", start + 1)
+    return None
+
+
+def _loads(candidate: str):
+    for text in (candidate, _TRAILING_COMMA.sub(r"\1", candidate)):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    try:
+        # single quotes / True / None: a Python literal is close enough
+        value = ast.literal_eval(_TRAILING_COMMA.sub(r"\1", candidate))
+        return value if isinstance(value, (dict, list)) else None
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def extract_json(raw_text):
+    """Parse model output as a JSON object, repairing common damage; None if hopeless."""
+    if not raw_text:
+        return None
+    text = raw_text.translate(_SMART_QUOTES).strip()
+    candidates = [text]
+    fenced = _FENCE.search(text)
+    if fenced:
+        candidates.append(fenced.group(1).strip())
+    block = _balanced_object(text)
+    if block:
+        candidates.append(block)
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        candidates.append(text[start:end + 1])
+    for candidate in candidates:
+        value = _loads(candidate)
+        if value is not None:
+            return value
+    return None
+
+
+def parse_rating(value):
+    """4, "4.5", "4/5", "8/10" -> float on the 0-5 scale; None if not a rating."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        rating = float(value)
+    elif isinstance(value, str):
+        m = _RATING.match(value)
+        if not m:
+            return None
+        rating = float(m.group(1))
+        if m.group(2) and float(m.group(2)) > 0:
+            rating = rating * RATING_MAX / float(m.group(2))
+    else:
+        return None
+    if rating != rating:  # NaN
+        return None
+    return round(min(RATING_MAX, max(RATING_MIN, rating)), 2)
+
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return " ".join(_text(v) for v in value).strip()
+    return str(value).strip()
+
+
+def validate_score(obj, index: int) -> dict:
+    """Normalize one ``per_question`` entry; raises SchemaError when it has no usable rating."""
+    if isinstance(obj, list) and len(obj) == 1:
+        obj = obj[0]
+    if not isinstance(obj, dict):
+        raise SchemaError(f"question {index}: expected an object, got {type(obj).__name__}")
+    rating = parse_rating(obj.get("rating", obj.get("score")))
+    if rating is None:
+        raise SchemaError(f"question {index}: missing or invalid rating {obj.get('rating')!r}")
+    return {
+        "index": int(index),
+        "rating": rating,
+        "strengths": _text(obj.get("strengths")),
+        "improvements": _text(obj.get("improvements")),
+    }
+
+
+def valid_score(obj, index: int):
+    """validate_score, or None instead of raising."""
+    try:
+        return validate_score(obj, index)
+    except SchemaError:
+        return None
+
+
+def validate_summary(obj, fallback_rating=None) -> dict:
+    """
+    Normalize the summary object (overall_summary, overall_rating, skills).
+
+    A missing or unreadable overall rating is replaced by ``fallback_rating``
+    and malformed skill entries are dropped; only a summary with no
+    overview text at all is rejected.
+    """
+    if not isinstance(obj, dict):
+        raise SchemaError(f"summary: expected an object, got {type(obj).__name__}")
+    summary = _text(obj.get("overall_summary") or obj.get("summary"))
+    if not summary:
+        raise SchemaError("summary: missing overall_summary")
+    rating = parse_rating(obj.get("overall_rating"))
+    skills = []
+    for skill in obj.get("skills") or []:
+        if isinstance(skill, dict) and _text(skill.get("name")):
+            skills.append({
+                "name": _text(skill.get("name")),
+                "rating": parse_rating(skill.get("rating")),
+                "note": _text(skill.get("note")),
+            })
+    return {
+        "overall_summary": summary,
+        "overall_rating": rating if rating is not None else fallback_rating,
+        "skills": skills,
+    }
+
+
+def mean_rating(per_question):
+    ratings = [pq["rating"] for pq in per_question if isinstance(pq.get("rating"), (int, float))]
+    return round(sum(ratings) / len(ratings), 2) if ratings else None
@@ -0,0 +1,242 @@
+# backend/services/evaluation.py
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from services.interview_store import get_interview_store, InterviewNotFound
+from services.llm_client import get_llm_client
+from services.metrics import LLM_PARSE_FAILURES, EVALUATIONS
+from services.prompt_budget import estimate_tokens, compact, fit_text, chunk_by_budget
+from services.eval_schema import extract_json, validate_score, validate_summary, valid_score, mean_rating, SchemaError
+
+# bump when the score or summary prompts change so cached reports are redone
+EVALUATION_PROMPT_VERSION = "2"
+# prompt size (estimated tokens) above which the summary is done map-reduce
+EVAL_TOKEN_BUDGET = int(os.getenv("EVAL_TOKEN_BUDGET", "6000"))
+# longer transcripts are cut down (middle removed) before scoring
+EVAL_TRANSCRIPT_MAX_TOKENS = int(os.getenv("EVAL_TRANSCRIPT_MAX_TOKENS", "1500"))
+# chunk summaries run in parallel, up to this many at once
+EVAL_MAP_CONCURRENCY = int(os.getenv("EVAL_MAP_CONCURRENCY", "4"))
+# times a malformed score/summary is sent back to be fixed (a short prompt) before giving up
+EVAL_REPAIR_ATTEMPTS = int(os.getenv("EVAL_REPAIR_ATTEMPTS", "1"))
+
+
+def parse_json(raw_text):
+    """Parse model output as JSON, repairing fences, trailing commas, stray prose and the like."""
+    return extract_json(raw_text)
+
+
+def _repair_prompt(raw_text, error, schema) -> str:
+    return f"""
+Your previous reply could not be used: {error}.
+Rewrite it as STRICT JSON with exactly this structure (no extra text). Keep
+the content; only fix the format and fill in anything that is missing.
+{schema}
+
+Previous reply:
+{fit_text(raw_text or "", 800)}
+"""
+
+
+def _parse_validated(raw_text, kind, validate, schema, context=None):
+    """
+    Parse and validate ``raw_text``; if that fails, ask the model to fix only
+    its own output (much shorter than the original prompt) and try again.
+
+    Returns ``(value or None, raw_text)``.
+    """
+    for attempt in range(EVAL_REPAIR_ATTEMPTS + 1):
+        try:
+            return validate(parse_json(raw_text)), raw_text
+        except SchemaError as e:
+            LLM_PARSE_FAILURES.inc(kind=kind)
+            error = e
+        if attempt < EVAL_REPAIR_ATTEMPTS:
+            raw_text = get_llm_client().generate(_repair_prompt(raw_text, error, schema),
+                                                 kind=f"{kind}_repair", context=context)
+    return None, raw_text
+
+
+def score_answer(name, role, difficulty, answer) -> dict:
+    """Rate one answer; returns a ``per_question`` entry."""
+    index = int(answer["index"])
+    prompt = f"""
+You are an interview evaluator. Rate this single answer concisely.
+
+Candidate: {name}
+Role: {role}
+Difficulty: {difficulty}
+
+Question: {compact(answer.get("question", ""))}
+Candidate's transcript: {fit_text(answer.get("transcript", ""), EVAL_TRANSCRIPT_MAX_TOKENS)}
+
+Return STRICT JSON with this exact structure (no extra text):
+{_score_schema(index)}
+"""
+    raw_text = get_llm_client().generate(prompt, kind="score", context={"index": index})
+    result, _ = _parse_validated(raw_text, "score", lambda obj: validate_score(obj, index),
+                                 _score_schema(index), context={"index": index})
+    if result is None:
+        raise ValueError(f"unparseable score for question {index}")
+    return result
+
+
+def _score_schema(index) -> str:
+    return f'{{"index": {index}, "rating": <0-5>, "strengths": "<one sentence>", "improvements": "<one sentence>"}}'
+
+
+SUMMARY_SCHEMA = """{
+  "overall_summary": "<2-4 sentence overview>",
+  "overall_rating": <float 0-5>,
+  "skills": [
+    {"name": "Communication", "rating": <0-5>, "note": "<one sentence>"},
+    {"name": "Problem Solving", "rating": <0-5>, "note": "<one sentence>"}
+  ]
+}"""
+
+
+def _summary_prompt(name, role, difficulty, scored, total=None) -> str:
+    scope = ""
+    if total is not None and len(scored) < total:
+        scope = (f"These are questions {scored[0]['index'] + 1}-{scored[-1]['index'] + 1} "
+                 f"of {total}; summarize only these.\n")
+    return f"""
+You are an interview evaluator. The answers below were already rated one by one.
+Summarize the candidate's overall performance.
+{scope}
+Candidate: {name}
+Role: {role}
+Difficulty: {difficulty}
+
+Per-question ratings as JSON:
+{json.dumps(scored, ensure_ascii=False, separators=(",", ":"))}
+
+Return STRICT JSON with this exact structure (no extra text):
+{SUMMARY_SCHEMA}
+"""
+
+
+def _merge_prompt(name, role, difficulty, partials) -> str:
+    return f"""
+You are an interview evaluator. The interview was long, so groups of questions
+were summarized separately. Merge these partial summaries into one evaluation.
+Weigh each part by its number of questions.
+
+Candidate: {name}
+Role: {role}
+Difficulty: {difficulty}
+
+Partial summaries as JSON:
+{json.dumps(partials, ensure_ascii=False, separators=(",", ":"))}
+
+Return STRICT JSON with this exact structure (no extra text):
+{SUMMARY_SCHEMA}
+"""
+
+
+def _summary_call(prompt, kind, fallback_rating=None):
+    raw_text = get_llm_client().generate(prompt, kind=kind)
+    return _parse_validated(raw_text, kind, lambda obj: validate_summary(obj, fallback_rating), SUMMARY_SCHEMA)
+
+
+def _weighted_rating(partials):
+    rated = [(p.get("overall_rating"), p["questions"]) for p in partials]
+    rated = [(float(r), n) for r, n in rated if isinstance(r, (int, float))]
+    total = sum(n for _, n in rated)
+    return round(sum(r * n for r, n in rated) / total, 2) if total else None
+
+
+def _reduce(name, role, difficulty, partials, budget):
+    """Merge partial summaries, in rounds if even they do not fit in one prompt."""
+    overhead = estimate_tokens(_merge_prompt(name, role, difficulty, []))
+    cost = lambda p: estimate_tokens(json.dumps(p, ensure_ascii=False)) + 1
+    groups = chunk_by_budget(partials, cost, max(1, budget - overhead))
+    if len(groups) > 1 and len(groups) < len(partials):
+        merged = []
+        for group in groups:
+            evaluation, raw_text = _reduce(name, role, difficulty, group, budget)
+            if evaluation is not None:
+                merged.append({**evaluation, "questions": sum(p["questions"] for p in group)})
+        partials = merged or partials
+    return _summary_call(_merge_prompt(name, role, difficulty, partials), "summary_merge",
+                         fallback_rating=_weighted_rating(partials))
+
+
+def summarize(name, role, difficulty, answers, per_question, budget=None):
+    """
+    Produce the overall part of the report from already-scored answers.
+
+    Returns ``(evaluation, raw_text)``; ``evaluation`` is None if the model
+    output could not be parsed. When the prompt would exceed the token
+    budget, chunks of questions are summarized concurrently (map) and the
+    partial summaries merged into one (reduce); the result has the same
+    schema either way.
+    """
+    budget = budget or EVAL_TOKEN_BUDGET
+    scored = [
+        {"index": a["index"], "question": fit_text(a["question"], 200), "rating": pq.get("rating"),
+         "strengths": compact(pq.get("strengths")), "improvements": compact(pq.get("improvements"))}
+        for a, pq in zip(answers, per_question)
+    ]
+    prompt = _summary_prompt(name, role, difficulty, scored)
+    if estimate_tokens(prompt) <= budget or len(scored) < 2:
+        EVALUATIONS.inc(mode="single")
+        evaluation, raw_text = _summary_call(prompt, "summary", fallback_rating=mean_rating(scored))
+    else:
+        EVALUATIONS.inc(mode="map_reduce")
+        overhead = estimate_tokens(_summary_prompt(name, role, difficulty, scored[:1], total=len(scored)))
+        cost = lambda s: estimate_tokens(json.dumps(s, ensure_ascii=False)) + 1
+        chunks = chunk_by_budget(scored, cost, max(1, budget - overhead))
+        with ThreadPoolExecutor(max_workers=max(1, min(EVAL_MAP_CONCURRENCY, len(chunks)))) as pool:
+            results = list(pool.map(
+                lambda chunk: _summary_call(_summary_prompt(name, role, difficulty, chunk, total=len(scored)),
+                                            "summary", fallback_rating=mean_rating(chunk)),
+                chunks,
+            ))
+        partials = [
+            {"questions": len(chunk), "overall_summary": ev.get("overall_summary"),
+             "overall_rating": ev.get("overall_rating"), "skills": ev.get("skills", [])}
+            for chunk, (ev, _) in zip(chunks, results) if ev is not None
+        ]
+        if not partials:
+            return None, results[-1][1] if results else ""
+        evaluation, raw_text = _reduce(name, role, difficulty, partials, budget)
+    if evaluation is None:
+        return None, raw_text
+    evaluation["per_question"] = per_question
+    return evaluation, raw_text
+
+
+def score_answer_job(interview_id: str, index: int, rev: str):
+    """Background job: score one saved answer and store the result on it."""
+    try:
+        state = get_interview_store().load(interview_id)
+    except InterviewNotFound:
+        return None
+    answer = next((a for a in state["answers"] if int(a["index"]) == int(index)), None)
+    if answer is None or answer.get("rev") != rev:
+        return None  # re-recorded since the job was queued
+    score = score_answer(state["candidate"], state["role"], state["difficulty"], answer)
+    get_interview_store().update_answer(interview_id, index, expect_rev=rev, score=score)
+    return score
+
+
+def score_job_key(interview_id: str, index: int, rev: str) -> str:
+    return f"score:{interview_id}:{int(index)}:{rev}"
+
+
+def evaluation_key(answers, model: str = "") -> str:
+    """
+    Content hash of everything a report evaluation depends on.
+
+    ``rev`` changes on every save_answer, so re-recording invalidates the
+    cached evaluation; transcripts and per-answer scores are included so a
+    server transcript or a re-score does too.
+    """
+    content = [
+        {"index": int(a["index"]), "rev": a.get("rev"), "transcript": a.get("transcript", ""),
+         "score": a.get("score")}
+        for a in sorted(answers, key=lambda a: int(a["index"]))
+    ]
+    payload = json.dumps([EVALUATION_PROMPT_VERSION, model, content], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
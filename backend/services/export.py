@@ -0,0 +1,183 @@
+# backend/services/export.py
+"""
+Bulk export of interview answers for offline analysis.
+
+One record per saved answer: the interview header fields, the question,
+the transcript and that question's rating. Everything is a generator over
+InterviewStore.iter_states, so memory stays flat however many interviews
+there are.
+
+    cd backend
+    python -m services.export --format csv --since 2025-01-01 --role "Data Scientist" > answers.csv
+    python -m services.export --format parquet --output answers.parquet   # needs pyarrow
+"""
+import io
+import sys
+import csv
+import json
+import argparse
+from services.interview_store import get_interview_store
+from services.evaluation import evaluation_key
+from services.llm_client import get_llm_client
+
+FIELDS = (
+    "interview_id", "created_at", "owner", "candidate", "role", "difficulty", "num_questions",
+    "q_index", "question", "transcript", "transcript_source", "rating", "strengths", "improvements",
+    "overall_rating",
+)
+FORMATS = ("ndjson", "csv", "parquet")
+PARQUET_BATCH_ROWS = 5000
+
+
+class ExportError(Exception):
+    pass
+
+
+def _matches(value, wanted):
+    return not wanted or (value or "").strip().lower() == wanted.strip().lower()
+
+
+def iter_records(store=None, since=None, until=None, role=None, difficulty=None):
+    """Yield one flat dict (keys = FIELDS) per saved answer matching the filters."""
+    store = store or get_interview_store()
+    model = get_llm_client().model_name
+    for state in store.iter_states(since=since, until=until):
+        if not (_matches(state.get("role"), role) and _matches(state.get("difficulty"), difficulty)):
+            continue
+        evaluation = state.get("evaluation") or {}
+        if evaluation and state.get("evaluation_key") != evaluation_key(state.get("answers", []), model):
+            evaluation = {}  # answers re-recorded or rescored since the report ran
+        # an answer's own score is always current; the report's only fills gaps
+        report_scores = {int(pq["index"]): pq for pq in evaluation.get("per_question") or []
+                         if isinstance(pq, dict) and "index" in pq}
+        for answer in state.get("answers", []):
+            index = int(answer["index"])
+            score = answer.get("score") or report_scores.get(index) or {}
+            yield {
+                "interview_id": state["id"],
+                "created_at": state.get("created_at"),
+                "owner": state.get("owner"),
+                "candidate": state.get("candidate"),
+                "role": state.get("role"),
+                "difficulty": state.get("difficulty"),
+                "num_questions": state.get("num_questions"),
+                "q_index": index,
+                "question": answer.get("question"),
+                "transcript": answer.get("transcript"),
+                "transcript_source": answer.get("transcript_source"),
+                "rating": score.get("rating"),
+                "strengths": score.get("strengths"),
+                "improvements": score.get("improvements"),
+                "overall_rating": evaluation.get("overall_rating"),
+            }
+
+
+def iter_ndjson(records):
+    for record in records:
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def iter_csv(records):
+    """CSV text in row-sized pieces (header first); one reused buffer."""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=FIELDS, extrasaction="ignore")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(record)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def write_parquet(records, path, batch_rows=PARQUET_BATCH_ROWS) -> int:
+    """
+    Write records to a Parquet file one row group per ``batch_rows``.
+
+    Parquet writes its footer last, so this needs a real file rather than a
+    stream. Returns the number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportError("Parquet export needs the pyarrow package")
+
+    schema = pa.schema([
+        ("interview_id", pa.string()), ("created_at", pa.string()), ("owner", pa.string()),
+        ("candidate", pa.string()), ("role", pa.string()), ("difficulty", pa.string()),
+        ("num_questions", pa.int32()), ("q_index", pa.int32()), ("question", pa.string()),
+        ("transcript", pa.string()), ("transcript_source", pa.string()), ("rating", pa.float64()),
+        ("strengths", pa.string()), ("improvements", pa.string()), ("overall_rating", pa.float64()),
+    ])
+    numeric = {"num_questions": int, "q_index": int, "rating": float, "overall_rating": float}
+
+    def coerce(record):
+        for name, cast in numeric.items():
+            try:
+                record[name] = None if record[name] is None else cast(record[name])
+            except (TypeError, ValueError):
+                record[name] = None
+        for name in FIELDS:
+            if name not in numeric and record[name] is not None and not isinstance(record[name], str):
+                record[name] = json.dumps(record[name], ensure_ascii=False)
+        return record
+
+    count = 0
+    batch = []
+    with pq.ParquetWriter(path, schema) as writer:
+        for record in records:
+            batch.append(coerce(record))
+            if len(batch) >= batch_rows:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+
+def stream(fmt, records):
+    """Text chunks for a streamable format (``ndjson`` or ``csv``)."""
+    if fmt == "ndjson":
+        return iter_ndjson(records)
+    if fmt == "csv":
+        return iter_csv(records)
+    raise ExportError(f"{fmt} cannot be streamed; use ndjson or csv")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export interview answers with their ratings")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--output", "-o", help="file to write (default stdout; required for parquet)")
+    parser.add_argument("--since", help="only interviews created on/after this ISO date")
+    parser.add_argument("--until", help="only interviews created before this ISO date")
+    parser.add_argument("--role", help="exact job role (case-insensitive)")
+    parser.add_argument("--difficulty", help="Easy, Medium or Hard (case-insensitive)")
+    args = parser.parse_args(argv)
+
+    records = iter_records(since=args.since, until=args.until, role=args.role, difficulty=args.difficulty)
+    try:
+        if args.format == "parquet":
+            if not args.output:
+                parser.error("--output is required for parquet")
+            count = write_parquet(records, args.output)
+            print(f"INFO: wrote {count} row(s) to {args.output}", file=sys.stderr)
+            return 0
+        out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+        try:
+            for chunk in stream(args.format, records):
+                out.write(chunk)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    except ExportError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+# backend/services/history_index.py
+import os
+import json
+import base64
+import sqlite3
+import threading
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HISTORY_DB = os.getenv("HISTORY_DB", os.path.join(BASE_DIR, "data", "history.db"))
+
+
+def encode_cursor(created_at: str, interview_id: str) -> str:
+    raw = json.dumps([created_at, interview_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """Return ``(created_at, interview_id)`` or None for a missing/garbled cursor."""
+    if not cursor:
+        return None
+    try:
+        created_at, interview_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(created_at), str(interview_id)
+    except (ValueError, TypeError):
+        return None
+
+
+class HistoryIndex:
+    """
+    Secondary index from user email to that user's interviews.
+
+    Interview state is sharded by interview id, so listing one user's
+    interviews would mean visiting every shard. This keeps one small row per
+    interview (email, created_at, role, rating...) in its own database, and
+    pages through it by keyset on (created_at, id): each page is a single
+    index range scan no matter how deep the user pages.
+    """
+
+    def __init__(self, path=HISTORY_DB):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS user_interviews (
+                    interview_id TEXT PRIMARY KEY,
+                    email TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    role TEXT,
+                    difficulty TEXT,
+                    num_questions INTEGER,
+                    overall_rating REAL,
+                    scored_at TEXT
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_user_interviews_email "
+                "ON user_interviews(email, created_at DESC, interview_id DESC)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add(self, email: str, state: dict) -> None:
+        """Index a newly created interview (or refresh its header fields)."""
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO user_interviews (interview_id, email, created_at, role, difficulty, num_questions)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (interview_id) DO UPDATE SET
+                    email = excluded.email, role = excluded.role,
+                    difficulty = excluded.difficulty, num_questions = excluded.num_questions
+                """,
+                (state["id"], email, state.get("created_at") or datetime.utcnow().isoformat() + "Z",
+                 state.get("role"), state.get("difficulty"), state.get("num_questions")),
+            )
+
+    def set_rating(self, interview_id: str, overall_rating) -> None:
+        """Record the overall rating once a report is scored (None clears it)."""
+        try:
+            rating = None if overall_rating is None else float(overall_rating)
+        except (TypeError, ValueError):
+            rating = None
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE user_interviews SET overall_rating = ?, scored_at = ? WHERE interview_id = ?",
+                (rating, datetime.utcnow().isoformat() + "Z" if rating is not None else None, interview_id),
+            )
+
+    def remove(self, interview_id: str) -> None:
+        with self._conn() as conn:
+            conn.execute("DELETE FROM user_interviews WHERE interview_id = ?", (interview_id,))
+
+    def page(self, email: str, limit: int = 20, cursor: str = None):
+        """
+        Return ``(items, next_cursor)``, newest first.
+
+        ``next_cursor`` is None on the last page.
+        """
+        after = decode_cursor(cursor)
+        sql = ("SELECT interview_id, created_at, role, difficulty, num_questions, overall_rating, scored_at "
+               "FROM user_interviews WHERE email = ?")
+        params = [email]
+        if after:
+            sql += " AND (created_at, interview_id) < (?, ?)"
+            params += list(after)
+        sql += " ORDER BY created_at DESC, interview_id DESC LIMIT ?"
+        params.append(limit + 1)
+        rows = [dict(r) for r in self._conn().execute(sql, params)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["interview_id"])
+        return rows, next_cursor
+
+    def backfill(self, interview_store) -> int:
+        """Index every existing interview that records its owner, once."""
+        with self._conn() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'backfilled'").fetchone():
+                return 0
+        count = 0
+        for interview_id in list(interview_store.iter_ids()):
+            try:
+                state = interview_store.load(interview_id)
+            except KeyError:
+                continue
+            if not state.get("owner"):
+                continue  # created before owners were recorded; cannot be attributed
+            state.setdefault("id", interview_id)
+            self.add(state["owner"], state)
+            if state.get("evaluation"):
+                self.set_rating(interview_id, state["evaluation"].get("overall_rating"))
+            count += 1
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('backfilled', ?)",
+                (datetime.utcnow().isoformat() + "Z",),
+            )
+        if count:
+            print(f"INFO: indexed {count} existing interview(s) in {self.path}")
+        return count
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_history_index() -> HistoryIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from services.interview_store import get_interview_store
+                index = HistoryIndex()
+                index.backfill(get_interview_store())
+                _index = index
+    return _index
@@ -0,0 +1,312 @@
+# backend/services/interview_store.py
+import os
+import json
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DATA_DIR = os.path.join(BASE_DIR, "data", "interviews")
+INTERVIEW_DB_DIR = os.getenv("INTERVIEW_DB_DIR", DATA_DIR)
+# where legacy <id>.json files are looked for (and renamed to .migrated once imported)
+INTERVIEW_LEGACY_DIR = os.getenv("INTERVIEW_LEGACY_DIR", DATA_DIR)
+INTERVIEW_DB_SHARDS = int(os.getenv("INTERVIEW_DB_SHARDS", "4"))
+LOCK_STRIPES = 64
+
+
+class InterviewNotFound(KeyError):
+    pass
+
+
+class InterviewStore:
+    """
+    Interview state kept in SQLite, sharded by interview id.
+
+    The interview header (everything except ``answers``) is one row in
+    ``interviews``; each answer is its own row in ``answers`` keyed by
+    (interview_id, idx), so saving an answer is a single upsert instead of
+    rewriting the whole document. Writes take a per-interview lock in-process
+    and run in an IMMEDIATE transaction so other workers are serialized too.
+    """
+
+    def __init__(self, db_dir=INTERVIEW_DB_DIR, shards=INTERVIEW_DB_SHARDS, legacy_dir=INTERVIEW_LEGACY_DIR):
+        self.db_dir = db_dir
+        self.legacy_dir = legacy_dir
+        self.paths = [os.path.join(db_dir, f"interviews-{i:02d}.db") for i in range(max(1, shards))]
+        self._local = threading.local()
+        self._locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        os.makedirs(db_dir, exist_ok=True)
+        for i in range(len(self.paths)):
+            conn = self._conn(i)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS interviews (
+                    id TEXT PRIMARY KEY,
+                    created_at TEXT,
+                    data TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS answers (
+                    interview_id TEXT NOT NULL,
+                    idx INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    updated_at TEXT,
+                    PRIMARY KEY (interview_id, idx)
+                )
+            """)
+
+    # --- plumbing -------------------------------------------------------
+
+    def _shard(self, interview_id: str) -> int:
+        return zlib.crc32(interview_id.encode("utf-8")) % len(self.paths)
+
+    def _conn(self, shard: int) -> sqlite3.Connection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get(shard)
+        if conn is None:
+            conn = sqlite3.connect(self.paths[shard], timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conns[shard] = conn
+        return conn
+
+    def _lock(self, interview_id: str):
+        return self._locks[zlib.adler32(interview_id.encode("utf-8")) % LOCK_STRIPES]
+
+    @contextmanager
+    def _write(self, interview_id: str):
+        conn = self._conn(self._shard(interview_id))
+        with self._lock(interview_id):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.utcnow().isoformat() + "Z"
+
+    # --- public API -----------------------------------------------------
+
+    def exists(self, interview_id: str) -> bool:
+        conn = self._conn(self._shard(interview_id))
+        row = conn.execute("SELECT 1 FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+        return row is not None or self._migrate_one(interview_id)
+
+    def load(self, interview_id: str) -> dict:
+        conn = self._conn(self._shard(interview_id))
+        row = conn.execute("SELECT data FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+        if row is None:
+            if not self._migrate_one(interview_id):
+                raise InterviewNotFound(interview_id)
+            row = conn.execute("SELECT data FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+        state = json.loads(row[0])
+        rows = conn.execute(
+            "SELECT data FROM answers WHERE interview_id = ? ORDER BY idx", (interview_id,)
+        )
+        state["answers"] = [json.loads(r[0]) for r in rows]
+        return state
+
+    def save(self, interview_id: str, state: dict) -> None:
+        """Write the whole state: header plus every answer, in one transaction."""
+        header = {k: v for k, v in state.items() if k != "answers"}
+        with self._write(interview_id) as conn:
+            self._put_header(conn, interview_id, header)
+            now = self._now()
+            conn.execute("DELETE FROM answers WHERE interview_id = ?", (interview_id,))
+            conn.executemany(
+                "INSERT INTO answers (interview_id, idx, data, updated_at) VALUES (?, ?, ?, ?)",
+                [(interview_id, int(a["index"]), json.dumps(a, ensure_ascii=False), now)
+                 for a in state.get("answers", [])],
+            )
+
+    def update(self, interview_id: str, **fields) -> None:
+        """Merge ``fields`` into the interview header without touching answers."""
+        with self._write(interview_id) as conn:
+            row = conn.execute("SELECT data FROM interviews WHERE id = ?", (interview_id,)).fetchone()
+            if row is None:
+                raise InterviewNotFound(interview_id)
+            header = json.loads(row[0])
+            header.update(fields)
+            self._put_header(conn, interview_id, header)
+
+    def save_answer(self, interview_id: str, answer: dict) -> int:
+        """Upsert a single answer row; returns the number of answers saved so far."""
+        with self._write(interview_id) as conn:
+            if conn.execute("SELECT 1 FROM interviews WHERE id = ?", (interview_id,)).fetchone() is None:
+                raise InterviewNotFound(interview_id)
+            conn.execute(
+                """
+                INSERT INTO answers (interview_id, idx, data, updated_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT (interview_id, idx) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+                """,
+                (interview_id, int(answer["index"]), json.dumps(answer, ensure_ascii=False), self._now()),
+            )
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM answers WHERE interview_id = ?", (interview_id,)
+            ).fetchone()
+        return count
+
+    def save_answer_once(self, interview_id: str, answer: dict):
+        """
+        Like save_answer, but idempotent on ``answer["client_upload_id"]``.
+
+        Returns ``(count, stored)``. When the row for this index already came
+        from the same client upload (a retried request), it is left alone and
+        ``stored`` is that existing answer rather than ``answer``.
+        """
+        with self._write(interview_id) as conn:
+            if conn.execute("SELECT 1 FROM interviews WHERE id = ?", (interview_id,)).fetchone() is None:
+                raise InterviewNotFound(interview_id)
+            row = conn.execute(
+                "SELECT data FROM answers WHERE interview_id = ? AND idx = ?", (interview_id, int(answer["index"]))
+            ).fetchone()
+            existing = json.loads(row[0]) if row else None
+            client_upload_id = answer.get("client_upload_id")
+            if existing and client_upload_id and existing.get("client_upload_id") == client_upload_id:
+                stored = existing
+            else:
+                stored = answer
+                conn.execute(
+                    """
+                    INSERT INTO answers (interview_id, idx, data, updated_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (interview_id, idx) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at
+                    """,
+                    (interview_id, int(answer["index"]), json.dumps(answer, ensure_ascii=False), self._now()),
+                )
+            (count,) = conn.execute(
+                "SELECT COUNT(*) FROM answers WHERE interview_id = ?", (interview_id,)
+            ).fetchone()
+        return count, stored
+
+    def update_answer(self, interview_id: str, index: int, expect_rev=None, **fields) -> bool:
+        """
+        Merge ``fields`` into one answer row.
+
+        With ``expect_rev`` the update only applies while the answer still has
+        that ``rev``, so results computed for an older recording are dropped.
+        """
+        with self._write(interview_id) as conn:
+            row = conn.execute(
+                "SELECT data FROM answers WHERE interview_id = ? AND idx = ?", (interview_id, int(index))
+            ).fetchone()
+            if row is None:
+                return False
+            answer = json.loads(row[0])
+            if expect_rev is not None and answer.get("rev") != expect_rev:
+                return False
+            answer.update(fields)
+            conn.execute(
+                "UPDATE answers SET data = ?, updated_at = ? WHERE interview_id = ? AND idx = ?",
+                (json.dumps(answer, ensure_ascii=False), self._now(), interview_id, int(index)),
+            )
+        return True
+
+    def delete(self, interview_id: str) -> bool:
+        """Remove an interview and all of its answers; returns False if it did not exist."""
+        with self._write(interview_id) as conn:
+            cur = conn.execute("DELETE FROM interviews WHERE id = ?", (interview_id,))
+            conn.execute("DELETE FROM answers WHERE interview_id = ?", (interview_id,))
+        return cur.rowcount > 0
+
+    def iter_ids(self):
+        for shard in range(len(self.paths)):
+            for (interview_id,) in self._conn(shard).execute("SELECT id FROM interviews"):
+                yield interview_id
+
+    def iter_states(self, since: str = None, until: str = None, batch: int = 200):
+        """
+        Yield every interview's full state, one at a time.
+
+        ``since``/``until`` bound ``created_at`` (ISO strings, until exclusive).
+        Shards are walked by keyset on id in small batches, so memory stays flat
+        and no read transaction is held open while the caller works.
+        """
+        for shard in range(len(self.paths)):
+            conn = self._conn(shard)
+            last_id = ""
+            while True:
+                sql = "SELECT id, data FROM interviews WHERE id > ?"
+                params = [last_id]
+                if since:
+                    sql += " AND created_at >= ?"
+                    params.append(since)
+                if until:
+                    sql += " AND created_at < ?"
+                    params.append(until)
+                rows = conn.execute(sql + " ORDER BY id LIMIT ?", params + [batch]).fetchall()
+                if not rows:
+                    break
+                for interview_id, data in rows:
+                    state = json.loads(data)
+                    state.setdefault("id", interview_id)
+                    state["answers"] = [json.loads(r[0]) for r in conn.execute(
+                        "SELECT data FROM answers WHERE interview_id = ? ORDER BY idx", (interview_id,)
+                    )]
+                    yield state
+                last_id = rows[-1][0]
+
+    def _put_header(self, conn, interview_id, header):
+        conn.execute(
+            """
+            INSERT INTO interviews (id, created_at, data) VALUES (?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET data = excluded.data
+            """,
+            (interview_id, header.get("created_at"), json.dumps(header, ensure_ascii=False)),
+        )
+
+    # --- legacy JSON migration -----------------------------------------
+
+    def _legacy_path(self, interview_id: str) -> str:
+        return os.path.join(self.legacy_dir, f"{interview_id}.json")
+
+    def _migrate_one(self, interview_id: str) -> bool:
+        path = self._legacy_path(interview_id)
+        if os.path.basename(path) != f"{interview_id}.json":
+            return False
+        with self._lock(interview_id):
+            if not os.path.exists(path):
+                # another thread may have just finished importing it
+                conn = self._conn(self._shard(interview_id))
+                return conn.execute("SELECT 1 FROM interviews WHERE id = ?", (interview_id,)).fetchone() is not None
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            self.save(interview_id, state)
+            os.replace(path, path + ".migrated")
+        return True
+
+    def migrate_legacy(self) -> int:
+        """Import every ``<id>.json`` left in the legacy flat directory."""
+        if not os.path.isdir(self.legacy_dir):
+            return 0
+        count = 0
+        for fname in os.listdir(self.legacy_dir):
+            if fname.endswith(".json"):
+                try:
+                    count += self._migrate_one(fname[:-len(".json")])
+                except (OSError, ValueError) as e:
+                    print(f"WARNING: could not migrate {fname}:", e)
+        if count:
+            print(f"INFO: migrated {count} interview(s) from {self.legacy_dir}")
+        return count
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_interview_store() -> InterviewStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = InterviewStore()
+                _store.migrate_legacy()
+    return _store
@@ -0,0 +1,153 @@
+# backend/services/jobs.py
+import os
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+from services.metrics import JOB_SECONDS, JOBS_QUEUED
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+JOBS_DB = os.getenv("JOBS_DB", os.path.join(BASE_DIR, "data", "jobs.db"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+# a pending job not touched for this long is assumed lost with its worker
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_SECONDS", "600"))
+# finished job rows are kept this long for polling, then pruned by the media sweeper
+JOB_RETENTION_DAYS = float(os.getenv("JOB_RETENTION_DAYS", "7"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobQueue:
+    """
+    Local worker pool with job status kept in SQLite.
+
+    Jobs run on threads in this process, but their status lives in a shared
+    database so a polling request can land on any worker. ``dedupe_key``
+    collapses repeated submissions while a matching job is still pending.
+    """
+
+    def __init__(self, path=JOBS_DB, workers=JOB_WORKERS):
+        self.path = path
+        self.workers = workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    dedupe_key TEXT,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    updated_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key, status)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="job")
+        return self._executor
+
+    def _set(self, job_id, status, result=None, error=None):
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ?",
+                (status, None if result is None else json.dumps(result), error, time.time(), job_id),
+            )
+
+    def _run(self, job_id, kind, fn, args, kwargs):
+        started = time.perf_counter()
+        status = FAILED
+        try:
+            self._set(job_id, RUNNING)
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            print(f"ERROR: job {job_id} failed:", e)
+            self._set(job_id, FAILED, error=str(e))
+        else:
+            status = DONE
+            self._set(job_id, DONE, result=result)
+        finally:
+            JOBS_QUEUED.dec(kind=kind)
+            JOB_SECONDS.observe(time.perf_counter() - started, kind=kind, status=status)
+
+    def submit(self, kind, fn, *args, dedupe_key=None, **kwargs) -> str:
+        now = time.time()
+        with self._conn() as conn:
+            if dedupe_key:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) AND updated_at > ?",
+                    (dedupe_key, QUEUED, RUNNING, now - JOB_STALE_SECONDS),
+                ).fetchone()
+                if row:
+                    return row["id"]
+            job_id = uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, dedupe_key, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, dedupe_key, QUEUED, now, now),
+            )
+        JOBS_QUEUED.inc(kind=kind)
+        self._pool().submit(self._run, job_id, kind, fn, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row["id"],
+            "kind": row["kind"],
+            "status": row["status"],
+            "result": json.loads(row["result"]) if row["result"] else None,
+            "error": row["error"],
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+
+    def prune(self, older_than: float = JOB_RETENTION_DAYS * 86400) -> int:
+        """Delete finished jobs not updated for ``older_than`` seconds; returns how many."""
+        with self._conn() as conn:
+            cur = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, time.time() - older_than),
+            )
+        return cur.rowcount
+
+
+_queues = {}
+_queue_lock = threading.Lock()
+
+
+def get_job_queue(pool: str = "default", workers: int = JOB_WORKERS) -> JobQueue:
+    """
+    Return this process's queue for ``pool``.
+
+    Pools share the status database but have their own threads, so slow
+    kinds of work (e.g. transcription) cannot starve answer scoring.
+    ``workers`` only applies when the pool is first created.
+    """
+    queue = _queues.get(pool)
+    if queue is None:
+        with _queue_lock:
+            queue = _queues.get(pool)
+            if queue is None:
+                queue = _queues[pool] = JobQueue(workers=workers)
+    return queue
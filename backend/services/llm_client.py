@@ -0,0 +1,387 @@
+# backend/services/llm_client.py
+import os
+import json
+import hashlib
+import random
+import threading
+import time
+import urllib.request
+from services.metrics import (
+    LLM_REQUEST_SECONDS, LLM_PROMPT_CHARS, LLM_RESPONSE_CHARS, LLM_RETRIES,
+    LLM_COALESCED, LLM_QUEUE_DEPTH, LLM_QUEUE_WAIT_SECONDS, LLM_SHED,
+)
+from services.rate_limit import TokenBucket, RateLimited
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# "gemini" talks to Google; "fake" is a deterministic offline backend for
+# development and load tests; "http" posts to a local fake LLM server.
+# Defaults to gemini only when a key is present.
+LLM_BACKEND = os.getenv("LLM_BACKEND") or ("gemini" if GEMINI_API_KEY else "fake")
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash")
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_FAKE_LATENCY_MS = float(os.getenv("LLM_FAKE_LATENCY_MS", "0"))
+LLM_HTTP_URL = os.getenv("LLM_HTTP_URL", "http://127.0.0.1:8765/generate")
+# merge identical in-flight generate() calls into one upstream request
+LLM_COALESCE = os.getenv("LLM_COALESCE", "1") == "1"
+# upstream requests per second per worker process (0 = unlimited), burst size,
+# and how many callers may queue for a token before new ones are shed
+LLM_RATE_LIMIT_RPS = float(os.getenv("LLM_RATE_LIMIT_RPS", "0"))
+LLM_RATE_BURST = int(os.getenv("LLM_RATE_BURST", "5"))
+LLM_RATE_MAX_QUEUE = int(os.getenv("LLM_RATE_MAX_QUEUE", "50"))
+
+_RETRYABLE_ERRORS = {
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded",
+    "InternalServerError", "TooManyRequests", "GatewayTimeout",
+}
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMOverloaded(LLMError):
+    """Shed by the rate limiter; callers fall back just as for any LLM error."""
+
+
+class LLMBackend:
+    """A backend turns a prompt into text. ``kind``/``context`` are hints only."""
+
+    name = "base"
+
+    def generate(self, prompt: str, timeout: float, kind: str = "text", context: dict = None) -> str:
+        raise NotImplementedError
+
+    def stream(self, prompt: str, timeout: float, kind: str = "text", context: dict = None):
+        """Yield the response in pieces; backends without streaming yield it whole."""
+        yield self.generate(prompt, timeout, kind=kind, context=context)
+
+
+class GeminiBackend(LLMBackend):
+    name = "gemini"
+
+    def __init__(self, model_name=LLM_MODEL, api_key=GEMINI_API_KEY):
+        # The SDK (and grpc/protobuf under it) takes a while to import, so it
+        # is loaded when the first LLM call builds the client rather than at
+        # import time; routes that never call the model never pay for it.
+        import google.generativeai as genai
+        if api_key:
+            genai.configure(api_key=api_key)
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(model_name)
+
+    def generate(self, prompt, timeout, kind="text", context=None):
+        resp = self.model.generate_content(prompt, request_options={"timeout": timeout})
+        return (resp.text or "").strip()
+
+    def stream(self, prompt, timeout, kind="text", context=None):
+        for chunk in self.model.generate_content(prompt, stream=True, request_options={"timeout": timeout}):
+            try:
+                text = chunk.text
+            except ValueError:
+                continue  # chunk without a text part (e.g. safety metadata)
+            if text:
+                yield text
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic stand-in for the real model.
+
+    Each call site passes a ``kind`` and the values it would otherwise have
+    baked into a mock, so responses have the same shape as real ones.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency_ms=LLM_FAKE_LATENCY_MS):
+        self.model_name = "fake"
+        self.latency_ms = latency_ms
+
+    def generate(self, prompt, timeout, kind="text", context=None):
+        if self.latency_ms:
+            time.sleep(min(self.latency_ms / 1000.0, timeout))
+        return self._respond(kind, context)
+
+    def stream(self, prompt, timeout, kind="text", context=None):
+        # Emit line by line, spreading the configured latency across lines
+        lines = self._respond(kind, context).split("\n")
+        for line in lines:
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000.0 / len(lines))
+            yield line + "\n"
+
+    def _respond(self, kind, context):
+        responder = getattr(self, f"_{kind}", None)
+        return responder(context or {}) if responder else ""
+
+    def _greeting(self, ctx):
+        return f"Hi {ctx.get('name', 'there')}! Welcome to your AI-powered interview. When you're ready, click Start Interview."
+
+    def _questions(self, ctx):
+        role, num = ctx.get("role", ""), int(ctx.get("num_questions", 1))
+        lines = [
+            f"Here goes your questions, {ctx.get('name', '')}, for the {role} role "
+            f"({ctx.get('num_questions')} questions, {ctx.get('difficulty', '')} difficulty)."
+        ]
+        lines += [f"{i+1}. Sample {role} question #{i+1}" for i in range(int(ctx.get("pool", num)))]
+        return "\n".join(lines)
+
+    def _score(self, ctx):
+        return json.dumps({
+            "index": ctx.get("index", 0), "rating": 3.5,
+            "strengths": "Answered confidently.", "improvements": "Add concrete examples.",
+        })
+
+    def _summary(self, ctx):
+        return json.dumps({
+            "overall_summary": "Solid communication with room for deeper specifics.",
+            "overall_rating": 3.8,
+            "skills": [
+                {"name": "Communication", "rating": 4.0, "note": "Clear and structured."},
+                {"name": "Problem Solving", "rating": 3.5, "note": "Reasonable approach, could justify trade-offs more."}
+            ],
+        }, indent=2)
+
+    _summary_merge = _summary
+    _summary_repair = _summary
+    _summary_merge_repair = _summary
+    _score_repair = _score
+
+
+class HttpBackend(LLMBackend):
+    """
+    Posts ``{"prompt", "kind", "context"}`` as JSON and reads ``{"text"}`` back.
+
+    Used with ``bench/fake_llm_server.py`` to put real network hops and
+    configurable latency under load tests without calling Google.
+    """
+
+    name = "http"
+
+    def __init__(self, url=LLM_HTTP_URL, model_name="http-fake"):
+        self.url = url
+        self.model_name = model_name
+
+    def generate(self, prompt, timeout, kind="text", context=None):
+        body = json.dumps({"prompt": prompt, "kind": kind, "context": context or {}}).encode("utf-8")
+        req = urllib.request.Request(self.url, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return json.loads(resp.read().decode("utf-8")).get("text", "").strip()
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if isinstance(getattr(exc, "reason", None), (TimeoutError, ConnectionError)):
+        return True  # urllib wraps socket errors in URLError
+    return type(exc).__name__ in _RETRYABLE_ERRORS or getattr(exc, "code", None) in (429, 500, 502, 503, 504)
+
+
+class _Flight:
+    """One in-flight upstream call that identical callers can wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class LLMClient:
+    """
+    Shared entry point for every LLM call in the app.
+
+    Holds one backend (and so one model object) per process, caps in-flight
+    calls with a semaphore, and retries transient failures with exponential
+    backoff inside an overall per-call deadline.
+    """
+
+    def __init__(self, backend: LLMBackend, timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES,
+                 max_concurrency=LLM_MAX_CONCURRENCY, coalesce=LLM_COALESCE, rate_limit=LLM_RATE_LIMIT_RPS,
+                 burst=LLM_RATE_BURST, max_queue=LLM_RATE_MAX_QUEUE):
+        self.backend = backend
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.coalesce = coalesce
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(rate_limit, burst, max_queue) if rate_limit > 0 else None
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def model_name(self) -> str:
+        return self.backend.model_name
+
+    @property
+    def is_fake(self) -> bool:
+        return self.backend.name == "fake"
+
+    def generate(self, prompt: str, kind: str = "text", context: dict = None, timeout: float = None) -> str:
+        """
+        Return the model's response to ``prompt``.
+
+        Identical calls (same kind, prompt and context) that arrive while one
+        is already in flight wait for that call instead of sending their own.
+        """
+        if not self.coalesce:
+            return self._observed_generate(prompt, kind, context, timeout)
+        key = hashlib.sha256(
+            json.dumps([kind, prompt, context], sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            LLM_COALESCED.inc(kind=kind)
+            if not flight.done.wait(timeout or self.timeout):
+                raise LLMError(f"LLM call ({kind}) exceeded its deadline waiting for an identical call")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        try:
+            flight.result = self._observed_generate(prompt, kind, context, timeout)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def _admit(self, kind, deadline):
+        """Wait for a rate-limit token, or shed the call if it cannot get one in time."""
+        if self._bucket is None:
+            return
+        LLM_QUEUE_DEPTH.inc()
+        try:
+            waited = self._bucket.acquire(deadline)
+        except RateLimited as e:
+            LLM_SHED.inc(kind=kind)
+            raise LLMOverloaded(f"LLM call ({kind}) shed: {e}")
+        finally:
+            LLM_QUEUE_DEPTH.dec()
+        LLM_QUEUE_WAIT_SECONDS.observe(waited, kind=kind)
+
+    def _observed_generate(self, prompt, kind, context, timeout) -> str:
+        started = time.perf_counter()
+        outcome = "error"
+        LLM_PROMPT_CHARS.observe(len(prompt), kind=kind)
+        try:
+            text = self._generate(prompt, kind, context, timeout)
+            outcome = "ok"
+            LLM_RESPONSE_CHARS.observe(len(text), kind=kind)
+            return text
+        finally:
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, kind=kind,
+                                        backend=self.backend.name, outcome=outcome)
+
+    def _generate(self, prompt, kind, context, timeout) -> str:
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._admit(kind, deadline)
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise LLMError("LLM concurrency limit reached before deadline")
+        try:
+            attempt = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMError(f"LLM call ({kind}) exceeded its deadline")
+                try:
+                    return self.backend.generate(prompt, remaining, kind=kind, context=context)
+                except Exception as e:
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    backoff = min(0.5 * 2 ** attempt, 8.0) * (0.5 + random.random() / 2)
+                    if time.monotonic() + backoff >= deadline:
+                        raise
+                    print(f"WARNING: LLM call ({kind}) failed, retrying in {backoff:.2f}s:", e)
+                    LLM_RETRIES.inc(kind=kind)
+                    time.sleep(backoff)
+                    attempt += 1
+        finally:
+            self._slots.release()
+
+    def stream(self, prompt: str, kind: str = "text", context: dict = None, timeout: float = None):
+        """
+        Like ``generate`` but yields text chunks as the model produces them.
+
+        Retries only happen before the first chunk; once output has been
+        handed to the caller a failure is raised as-is.
+        """
+        started = time.perf_counter()
+        outcome = "error"
+        size = 0
+        LLM_PROMPT_CHARS.observe(len(prompt), kind=kind)
+        chunks = self._stream(prompt, kind, context, timeout)
+        try:
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+            outcome = "ok"
+        except GeneratorExit:
+            outcome = "abandoned"
+            raise
+        finally:
+            chunks.close()  # releases the concurrency slot right away
+            LLM_RESPONSE_CHARS.observe(size, kind=kind)
+            LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, kind=kind,
+                                        backend=self.backend.name, outcome=outcome)
+
+    def _stream(self, prompt, kind, context, timeout):
+        deadline = time.monotonic() + (timeout or self.timeout)
+        self._admit(kind, deadline)
+        if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            raise LLMError("LLM concurrency limit reached before deadline")
+        try:
+            attempt = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise LLMError(f"LLM stream ({kind}) exceeded its deadline")
+                emitted = False
+                try:
+                    for chunk in self.backend.stream(prompt, remaining, kind=kind, context=context):
+                        emitted = True
+                        yield chunk
+                    return
+                except Exception as e:
+                    if emitted or attempt >= self.max_retries or not _is_retryable(e):
+                        raise
+                    backoff = min(0.5 * 2 ** attempt, 8.0) * (0.5 + random.random() / 2)
+                    if time.monotonic() + backoff >= deadline:
+                        raise
+                    print(f"WARNING: LLM stream ({kind}) failed, retrying in {backoff:.2f}s:", e)
+                    LLM_RETRIES.inc(kind=kind)
+                    time.sleep(backoff)
+                    attempt += 1
+        finally:
+            self._slots.release()
+
+
+def make_backend(name: str = LLM_BACKEND) -> LLMBackend:
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "fake":
+        return FakeBackend()
+    if name == "http":
+        return HttpBackend()
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient(make_backend())
+    return _client
@@ -0,0 +1,365 @@
+# backend/services/media_gc.py
+"""
+Background sweeper for recorded answer videos.
+
+Cross-references the video files in the upload directories with the answers
+in the interview store and, a batch at a time:
+
+- deletes videos no answer points at any more (re-recorded questions, saves
+  that never completed) once they are older than a grace period,
+- deletes interviews past the retention window together with their videos,
+  and, when ABANDONED_INTERVIEW_HOURS is set, empty interviews abandoned
+  before the first answer (both off by default: they remove user records),
+- evicts the oldest recordings of users over their quota, then the oldest
+  overall while the global quota is exceeded (scores and reports are kept),
+- removes chunked uploads that were never finalized.
+
+Renditions, posters and previews made by the media worker live and die
+with their original video.
+
+Only one process sweeps at a time; the others see the lease and skip.
+
+    cd backend
+    python -m services.media_gc --dry-run
+"""
+import os
+import json
+import sqlite3
+import threading
+import time
+import argparse
+import multiprocessing
+from contextlib import closing
+from datetime import datetime, timezone
+from services import upload_service
+from services.interview_store import get_interview_store, InterviewNotFound
+from services.history_index import get_history_index
+from services.jobs import get_job_queue
+from services.metrics import MEDIA_GC_FILES, MEDIA_GC_BYTES, UPLOAD_STORED_BYTES
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+MEDIA_GC_DB = os.getenv("MEDIA_GC_DB", os.path.join(BASE_DIR, "data", "media_gc.db"))
+MEDIA_GC_INTERVAL = float(os.getenv("MEDIA_GC_INTERVAL", "3600"))  # 0 disables the background sweeper
+MEDIA_GC_BATCH = int(os.getenv("MEDIA_GC_BATCH", "100"))
+MEDIA_GC_BATCH_PAUSE = float(os.getenv("MEDIA_GC_BATCH_PAUSE", "0.1"))
+MEDIA_ORPHAN_GRACE_SECONDS = float(os.getenv("MEDIA_ORPHAN_GRACE_SECONDS", "3600"))
+MEDIA_RETENTION_DAYS = float(os.getenv("MEDIA_RETENTION_DAYS", "0"))  # 0 keeps interviews forever
+ABANDONED_INTERVIEW_HOURS = float(os.getenv("ABANDONED_INTERVIEW_HOURS", "0"))  # 0 keeps them
+UPLOAD_TMP_MAX_AGE_SECONDS = float(os.getenv("UPLOAD_TMP_MAX_AGE_SECONDS", "86400"))
+MEDIA_USER_QUOTA_MB = float(os.getenv("MEDIA_USER_QUOTA_MB", "0"))  # 0 = unlimited
+MEDIA_GLOBAL_QUOTA_MB = float(os.getenv("MEDIA_GLOBAL_QUOTA_MB", "0"))  # 0 = unlimited
+
+# a claimed sweep that has not finished after this long is assumed dead
+SWEEP_LEASE_SECONDS = 1800
+
+
+def _timestamp(iso: str) -> float:
+    try:
+        return datetime.fromisoformat((iso or "").rstrip("Z")).replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _size(path: str):
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+
+
+class MediaSweeper:
+    def __init__(self, store=None, db_path=MEDIA_GC_DB, batch=MEDIA_GC_BATCH, batch_pause=MEDIA_GC_BATCH_PAUSE,
+                 grace=MEDIA_ORPHAN_GRACE_SECONDS, retention_days=MEDIA_RETENTION_DAYS,
+                 abandoned_hours=ABANDONED_INTERVIEW_HOURS, tmp_max_age=UPLOAD_TMP_MAX_AGE_SECONDS,
+                 user_quota_mb=MEDIA_USER_QUOTA_MB, global_quota_mb=MEDIA_GLOBAL_QUOTA_MB):
+        self.store = store or get_interview_store()
+        self.db_path = db_path
+        self.batch = max(1, batch)
+        self.batch_pause = batch_pause
+        self.grace = grace
+        self.retention = retention_days * 86400
+        self.abandoned = abandoned_hours * 3600
+        self.tmp_max_age = tmp_max_age
+        self.user_quota = int(user_quota_mb * 1024 * 1024)
+        self.global_quota = int(global_quota_mb * 1024 * 1024)
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, held_until REAL NOT NULL)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at REAL,
+                    finished_at REAL,
+                    dry_run INTEGER,
+                    report TEXT
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # --- lease ----------------------------------------------------------
+
+    def _claim(self, until: float) -> bool:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT held_until FROM lease WHERE name = 'sweep'").fetchone()
+            if row and row[0] > time.time():
+                conn.execute("ROLLBACK")
+                return False
+            self._hold(conn, until)
+            conn.execute("COMMIT")
+        return True
+
+    def _release(self, until: float):
+        with closing(self._connect()) as conn:
+            self._hold(conn, until)
+
+    @staticmethod
+    def _hold(conn, until):
+        conn.execute(
+            "INSERT INTO lease (name, held_until) VALUES ('sweep', ?) "
+            "ON CONFLICT (name) DO UPDATE SET held_until = excluded.held_until",
+            (until,),
+        )
+
+    # --- sweep ----------------------------------------------------------
+
+    def run_once(self, dry_run=False, next_run_in=0.0, force=False):
+        """
+        Sweep once and return a report, or None if another process holds the lease.
+
+        ``next_run_in`` keeps the lease after the sweep so other workers do
+        not repeat it until the next scheduled run.
+        """
+        started = time.time()
+        if not force and not self._claim(started + SWEEP_LEASE_SECONDS):
+            return None
+        report = {"dry_run": dry_run, "files_deleted": 0, "bytes_reclaimed": 0, "interviews_deleted": 0,
+                  "answers_evicted": 0, "bytes_stored": 0, "by_reason": {}}
+        self._dry_run = dry_run
+        self._ops = 0
+        try:
+            referenced = self._sweep_interviews(report)
+            self._sweep_orphans(referenced, report)
+            self._enforce_quotas(referenced, report)
+            self._sweep_tmp(report)
+            if not dry_run:
+                self._prune_jobs(report)
+            report["bytes_stored"] = sum(r["size"] for r in referenced.values())
+            if not dry_run:
+                UPLOAD_STORED_BYTES.set(report["bytes_stored"])
+        finally:
+            self._release(started + next_run_in)
+        report["duration_seconds"] = round(time.time() - started, 3)
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO runs (started_at, finished_at, dry_run, report) VALUES (?, ?, ?, ?)",
+                (started, time.time(), int(dry_run), json.dumps(report)),
+            )
+        return report
+
+    def _tick(self):
+        # pause between batches so the sweep never hogs the disk or the DB
+        self._ops += 1
+        if self._ops % self.batch == 0 and self.batch_pause:
+            time.sleep(self.batch_pause)
+
+    def _remove(self, path: str, reason: str, report: dict):
+        try:
+            size = os.path.getsize(path)
+            if not self._dry_run:
+                os.remove(path)
+        except FileNotFoundError:
+            return
+        report["files_deleted"] += 1
+        report["bytes_reclaimed"] += size
+        by_reason = report["by_reason"].setdefault(reason, {"files": 0, "bytes": 0})
+        by_reason["files"] += 1
+        by_reason["bytes"] += size
+        if not self._dry_run:
+            MEDIA_GC_FILES.inc(reason=reason)
+            MEDIA_GC_BYTES.inc(size, reason=reason)
+        self._tick()
+
+    def _sweep_interviews(self, report) -> dict:
+        """Drop expired/abandoned interviews; return ``{path: info}`` for every live video."""
+        now = time.time()
+        referenced = {}
+        for interview_id in list(self.store.iter_ids()):
+            try:
+                state = self.store.load(interview_id)
+            except InterviewNotFound:
+                continue
+            created = _timestamp(state.get("created_at"))
+            age = now - created if created else 0.0
+            videos = [(a, upload_service.video_path(a)) for a in state["answers"]]
+            expired = self.retention and age > self.retention
+            abandoned = not state["answers"] and self.abandoned and age > self.abandoned
+            if expired or abandoned:
+                if not self._dry_run:
+                    self.store.delete(interview_id)
+                    get_history_index().remove(interview_id)
+                report["interviews_deleted"] += 1
+                for answer, path in videos:
+                    for p in ([path] if path else []) + upload_service.derived_paths(answer):
+                        self._remove(p, "expired", report)
+                self._tick()
+                continue
+            for answer, path in videos:
+                if path:
+                    # files can vanish under us (re-record, eviction elsewhere, a media job)
+                    size = _size(path)
+                    if size is None:
+                        continue
+                    derived = []
+                    for p in upload_service.derived_paths(answer):
+                        derived_size = _size(p)
+                        if derived_size is not None:
+                            derived.append(p)
+                            size += derived_size
+                    referenced[path] = {
+                        "interview_id": interview_id,
+                        "index": int(answer["index"]),
+                        "rev": answer.get("rev"),
+                        "owner": state.get("owner") or "",
+                        "created": created,
+                        "size": size,
+                        "derived": derived,
+                    }
+        return referenced
+
+    def _sweep_orphans(self, referenced, report):
+        cutoff = time.time() - self.grace
+        derived = {p for info in referenced.values() for p in info["derived"]}
+        for directory in (upload_service.UPLOAD_DIR, upload_service.LEGACY_UPLOAD_DIR):
+            if not os.path.isdir(directory):
+                continue
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if upload_service.is_derived_name(entry.name):
+                        if entry.path in derived:
+                            continue
+                    elif not upload_service.is_video_name(entry.name) or entry.path in referenced:
+                        continue
+                    # a file saved moments ago may not be linked to its answer yet
+                    if entry.stat().st_mtime < cutoff:
+                        self._remove(entry.path, "orphan", report)
+
+    def _evict(self, path, info, report) -> bool:
+        if not self._dry_run:
+            ok = self.store.update_answer(info["interview_id"], info["index"], expect_rev=info["rev"],
+                                          video_file=None, video_url=None, media=None, video_evicted="quota")
+            if not ok:
+                return False  # re-recorded meanwhile; the new file is not this one
+        for p in [path] + info["derived"]:
+            self._remove(p, "quota", report)
+        report["answers_evicted"] += 1
+        return True
+
+    def _enforce_quotas(self, referenced, report):
+        oldest_first = sorted(referenced.items(), key=lambda kv: (kv[1]["created"], kv[1]["index"]))
+        if self.user_quota:
+            usage = {}
+            for _, info in oldest_first:
+                usage[info["owner"]] = usage.get(info["owner"], 0) + info["size"]
+            for path, info in oldest_first:
+                owner = info["owner"]
+                if owner and usage[owner] > self.user_quota and self._evict(path, info, report):
+                    usage[owner] -= info["size"]
+                    del referenced[path]
+        if self.global_quota:
+            total = sum(info["size"] for info in referenced.values())
+            for path, info in oldest_first:
+                if total <= self.global_quota:
+                    break
+                if path in referenced and self._evict(path, info, report):
+                    total -= info["size"]
+                    del referenced[path]
+
+    def _sweep_tmp(self, report):
+        cutoff = time.time() - self.tmp_max_age
+        tmp_dir = upload_service.UPLOAD_TMP_DIR
+        if os.path.isdir(tmp_dir):
+            with os.scandir(tmp_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith((".part", ".meta.json")) and entry.stat().st_mtime < cutoff:
+                        self._remove(entry.path, "stale_upload", report)
+        # half-written ffmpeg output from a media worker that crashed or was killed
+        for directory in (upload_service.UPLOAD_DIR, upload_service.LEGACY_UPLOAD_DIR):
+            if not os.path.isdir(directory):
+                continue
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if (entry.name.endswith(".tmp") and upload_service.is_derived_name(entry.name[:-len(".tmp")])
+                            and entry.stat().st_mtime < cutoff):
+                        self._remove(entry.path, "stale_encode", report)
+
+    def _prune_jobs(self, report):
+        # the job table lives elsewhere, but this is the one periodic leased task we have
+        try:
+            report["jobs_pruned"] = get_job_queue().prune()
+        except sqlite3.Error as e:
+            print("WARNING: pruning finished jobs failed:", e)
+
+    def recent_runs(self, limit=10) -> list:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT started_at, report FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"started_at": started, **json.loads(report)} for started, report in rows]
+
+
+_thread = None
+_thread_lock = threading.Lock()
+
+
+def start_background_sweeper(interval=MEDIA_GC_INTERVAL):
+    """Run the sweeper every ``interval`` seconds on a daemon thread (once per process)."""
+    global _thread
+    # spawned helper processes re-import the app module; only the app sweeps
+    if interval <= 0 or multiprocessing.parent_process() is not None:
+        return
+    with _thread_lock:
+        if _thread is not None:
+            return
+
+        def loop():
+            time.sleep(min(interval, 60))  # stay out of the way while the app starts
+            while True:
+                try:
+                    report = MediaSweeper().run_once(next_run_in=interval)
+                    if report and report["files_deleted"]:
+                        print(f"INFO: media sweep removed {report['files_deleted']} file(s), "
+                              f"{report['bytes_reclaimed']} bytes reclaimed")
+                except Exception as e:
+                    print("WARNING: media sweep failed:", e)
+                time.sleep(interval)
+
+        _thread = threading.Thread(target=loop, name="media-gc", daemon=True)
+        _thread.start()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Delete orphaned, expired and over-quota answer videos")
+    parser.add_argument("--dry-run", action="store_true", help="report what would be deleted")
+    parser.add_argument("--force", action="store_true", help="ignore another worker's lease")
+    parser.add_argument("--history", type=int, default=0, help="print the last N sweep reports instead")
+    args = parser.parse_args(argv)
+
+    sweeper = MediaSweeper()
+    if args.history:
+        print(json.dumps(sweeper.recent_runs(args.history), indent=2))
+        return 0
+    report = sweeper.run_once(dry_run=args.dry_run, force=args.force)
+    if report is None:
+        print("Another sweep is running or ran recently; use --force to sweep anyway")
+        return 1
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,260 @@
+# backend/services/media_worker.py
+"""
+Background re-encoding of recorded answers.
+
+The browser uploads whatever its MediaRecorder produced (VP8/VP9 webm at
+several Mbit/s). After an answer is saved, a background job runs a local
+ffmpeg in a small process pool and writes, next to the original:
+
+- ``<stem>.rendition.webm``: bitrate-capped, height-capped VP9/Opus, kept only
+  when it is actually smaller than the original,
+- ``<stem>.poster.jpg``: a thumbnail frame,
+- ``<stem>.preview.webm``: a few silent seconds at low resolution.
+
+Their file names are stored on the answer under ``media`` so the report can
+show posters first and load video only when asked. The original is kept;
+the media sweeper removes the derived files together with it.
+"""
+import os
+import shutil
+import subprocess
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from services import upload_service
+from services.interview_store import get_interview_store, InterviewNotFound
+from services.metrics import MEDIA_ENCODE_SECONDS, MEDIA_ENCODE_BYTES
+
+# auto (on when ffmpeg is found) | on | off
+MEDIA_RENDITIONS = os.getenv("MEDIA_RENDITIONS", "auto")
+MEDIA_PROCESSES = int(os.getenv("MEDIA_PROCESSES", "1"))
+MEDIA_THREADS = int(os.getenv("MEDIA_THREADS", "1"))  # ffmpeg threads per process
+MEDIA_NICE = int(os.getenv("MEDIA_NICE", "10"))
+MEDIA_TIMEOUT = float(os.getenv("MEDIA_TIMEOUT", "600"))
+MEDIA_VIDEO_KBPS = int(os.getenv("MEDIA_VIDEO_KBPS", "600"))
+MEDIA_AUDIO_KBPS = int(os.getenv("MEDIA_AUDIO_KBPS", "64"))
+MEDIA_MAX_HEIGHT = int(os.getenv("MEDIA_MAX_HEIGHT", "480"))
+MEDIA_POSTER_HEIGHT = int(os.getenv("MEDIA_POSTER_HEIGHT", "360"))
+MEDIA_PREVIEW_SECONDS = float(os.getenv("MEDIA_PREVIEW_SECONDS", "4"))
+MEDIA_PREVIEW_HEIGHT = int(os.getenv("MEDIA_PREVIEW_HEIGHT", "240"))
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+
+
+class MediaError(Exception):
+    pass
+
+
+def _scale(height: int) -> str:
+    # never upscale; keep the width even for the encoder
+    return f"scale=-2:'min({height},ih)'"
+
+
+def _ffmpeg(args, out_path, threads=MEDIA_THREADS):
+    """Run ffmpeg into a temp file and move it to ``out_path`` only on success."""
+    tmp_path = out_path + ".tmp"
+    cmd = [FFMPEG_BIN, "-nostdin", "-v", "error", "-y", "-threads", str(threads), *args, tmp_path]
+    try:
+        try:
+            out = subprocess.run(cmd, capture_output=True, text=True, timeout=MEDIA_TIMEOUT)
+        except FileNotFoundError:
+            raise MediaError(f"{FFMPEG_BIN} not found; install ffmpeg or set FFMPEG_BIN")
+        except subprocess.TimeoutExpired:
+            raise MediaError(f"ffmpeg took longer than {MEDIA_TIMEOUT:.0f}s")
+        if out.returncode != 0 or not os.path.isfile(tmp_path) or os.path.getsize(tmp_path) == 0:
+            raise MediaError(f"ffmpeg failed: {out.stderr.strip()[:200]}")
+        os.replace(tmp_path, out_path)
+    finally:
+        # gone after a successful replace; anything left is a failed or interrupted encode.
+        # A killed worker never gets here; the media sweeper removes what it leaves behind.
+        _discard(tmp_path)
+
+
+def _discard(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def encode_rendition(src, dest, threads=MEDIA_THREADS):
+    kbps = MEDIA_VIDEO_KBPS
+    _ffmpeg([
+        "-i", src, "-vf", _scale(MEDIA_MAX_HEIGHT),
+        "-c:v", "libvpx-vp9", "-b:v", f"{kbps}k", "-maxrate", f"{kbps * 4 // 3}k", "-bufsize", f"{kbps * 2}k",
+        "-deadline", "good", "-cpu-used", "4", "-row-mt", "1",
+        "-c:a", "libopus", "-b:a", f"{MEDIA_AUDIO_KBPS}k", "-f", "webm",
+    ], dest, threads)
+
+
+def encode_poster(src, dest, threads=MEDIA_THREADS):
+    # browser recordings often lack a duration, so a seek past the end is
+    # only noticed as "no frame written": fall back to the first frame
+    for seek in ("1", "0"):
+        try:
+            return _ffmpeg(["-ss", seek, "-i", src, "-frames:v", "1", "-vf", _scale(MEDIA_POSTER_HEIGHT),
+                            "-q:v", "4", "-f", "image2"], dest, threads)
+        except MediaError:
+            if seek == "0":
+                raise
+
+
+def encode_preview(src, dest, threads=MEDIA_THREADS):
+    _ffmpeg([
+        "-i", src, "-t", str(MEDIA_PREVIEW_SECONDS), "-an", "-vf", _scale(MEDIA_PREVIEW_HEIGHT),
+        "-c:v", "libvpx-vp9", "-b:v", "200k", "-deadline", "realtime", "-cpu-used", "8", "-f", "webm",
+    ], dest, threads)
+
+
+# --- worker process side --------------------------------------------------
+
+_threads = MEDIA_THREADS
+
+
+def _init_worker(threads, nice):
+    global _threads
+    _threads = threads
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+
+
+def _process_in_worker(video_path: str) -> dict:
+    """Write the derived files next to ``video_path``; returns ``{variant: filename}``."""
+    media = {}
+    directory = os.path.dirname(video_path)
+    original_size = os.path.getsize(video_path)
+    steps = (("poster", encode_poster), ("preview", encode_preview), ("rendition", encode_rendition))
+    for variant, encode in steps:
+        name = upload_service.derived_name(os.path.basename(video_path), variant)
+        path = os.path.join(directory, name)
+        try:
+            encode(video_path, path, _threads)
+        except MediaError as e:
+            media.setdefault("errors", {})[variant] = str(e)
+            continue
+        if variant == "rendition" and os.path.getsize(path) >= original_size:
+            _discard(path)  # already small enough; serve the original
+            continue
+        media[variant] = name
+    return media
+
+
+# --- app side -------------------------------------------------------------
+
+class MediaProcessor:
+    """
+    Owns the ffmpeg process pool. Workers are spawned (not forked from the
+    threaded web process) and reniced so encoding yields to request handling.
+    """
+
+    def __init__(self, mode=MEDIA_RENDITIONS, processes=MEDIA_PROCESSES, threads=MEDIA_THREADS,
+                 nice=MEDIA_NICE, timeout=MEDIA_TIMEOUT):
+        self.mode = mode
+        self.processes = max(1, processes)
+        self.threads = max(1, threads)
+        self.nice = nice
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+        # looked up once: enabled is checked on every saved answer
+        self._ffmpeg_found = shutil.which(FFMPEG_BIN) is not None if mode == "auto" else None
+
+    @property
+    def enabled(self) -> bool:
+        if self.mode == "auto":
+            return self._ffmpeg_found
+        return self.mode in ("on", "1", "true")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.threads, self.nice),
+                )
+            return self._pool
+
+    def _reset_pool(self, pool, terminate=False):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        if terminate:
+            # shutdown() does not stop a running encode; later jobs would queue behind it
+            for process in list((getattr(pool, "_processes", None) or {}).values()):
+                process.terminate()
+
+    def process(self, video_path: str) -> dict:
+        started = time.perf_counter()
+        outcome = "error"
+        pool = self._get_pool()
+        try:
+            media = pool.submit(_process_in_worker, video_path).result(timeout=self.timeout)
+            outcome = "partial" if media.get("errors") else "ok"
+            return media
+        except FutureTimeout:
+            self._reset_pool(pool, terminate=True)
+            raise MediaError(f"media processing took longer than {self.timeout:.0f}s")
+        except BrokenProcessPool:
+            self._reset_pool(pool)
+            raise MediaError("media worker crashed")
+        finally:
+            MEDIA_ENCODE_SECONDS.observe(time.perf_counter() - started, outcome=outcome)
+
+
+_processor = None
+_processor_lock = threading.Lock()
+
+
+def get_media_processor() -> MediaProcessor:
+    global _processor
+    if _processor is None:
+        with _processor_lock:
+            if _processor is None:
+                _processor = MediaProcessor()
+    return _processor
+
+
+def process_media_job(interview_id: str, index: int, rev: str):
+    """Background job: build the rendition, poster and preview of one saved answer."""
+    try:
+        state = get_interview_store().load(interview_id)
+    except InterviewNotFound:
+        return None
+    answer = next((a for a in state["answers"] if int(a["index"]) == int(index)), None)
+    if answer is None or answer.get("rev") != rev:
+        return None  # re-recorded since the job was queued
+
+    path = upload_service.video_path(answer)
+    if path is None:
+        get_interview_store().update_answer(interview_id, index, expect_rev=rev, media_status="failed")
+        return None
+    try:
+        media = get_media_processor().process(path)
+    except MediaError as e:
+        print(f"WARNING: media processing of {interview_id}#{index} failed:", e)
+        get_interview_store().update_answer(interview_id, index, expect_rev=rev, media_status="failed")
+        return None
+    for variant, error in media.pop("errors", {}).items():
+        print(f"WARNING: {variant} for {interview_id}#{index} failed:", error)
+
+    directory = os.path.dirname(path)
+    original_size = os.path.getsize(path)
+    for variant, name in media.items():
+        MEDIA_ENCODE_BYTES.inc(os.path.getsize(os.path.join(directory, name)), variant=variant)
+    if "rendition" in media:
+        MEDIA_ENCODE_BYTES.inc(original_size, variant="original")
+    ok = get_interview_store().update_answer(interview_id, index, expect_rev=rev, media=media,
+                                             media_status="done" if media else "failed")
+    if not ok:
+        # re-recorded while encoding; these files belong to nobody
+        for name in media.values():
+            _discard(os.path.join(directory, name))
+    return media
+
+
+def media_job_key(interview_id: str, index: int, rev: str) -> str:
+    return f"media:{interview_id}:{int(index)}:{rev}"
@@ -0,0 +1,210 @@
+# backend/services/metrics.py
+"""
+Tiny in-process metrics registry rendered in the Prometheus text format.
+
+Each worker process keeps its own numbers; scrape every worker (or put them
+behind a per-worker port) when running more than one.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_one(key, value))
+        return lines
+
+    def _render_one(self, key, value):
+        return [f"{self.name}{_labels(self.labelnames, key)} {value}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount=1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount=1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_one(self, key, value):
+        counts, total, count = value
+        lines = []
+        for bound, c in zip(self.buckets, counts):
+            le = 'le="%s"' % bound
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {c}")
+        le = 'le="+Inf"'
+        lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+        lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {total}")
+        lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._get(Counter, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self._get(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# --- HTTP ---------------------------------------------------------------
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Request latency by blueprint endpoint.", ("endpoint", "method", "status"))
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "Requests currently being handled.")
+
+# --- Auth ---------------------------------------------------------------
+PASSWORD_HASH_SECONDS = REGISTRY.histogram(
+    "password_hash_duration_seconds", "CPU time of one password hash or check.", ("op",))
+PASSWORD_HASH_WAITING = REGISTRY.gauge(
+    "password_hash_in_progress", "Password hashes admitted and queued or running.")
+PASSWORD_HASH_REJECTED = REGISTRY.counter(
+    "password_hash_rejected_total", "Hashes turned away because the hashing pool was saturated.", ("op",))
+
+# --- LLM ----------------------------------------------------------------
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "llm_request_duration_seconds", "LLM call latency including retries.", ("kind", "backend", "outcome"))
+LLM_PROMPT_CHARS = REGISTRY.histogram(
+    "llm_prompt_chars", "Prompt size in characters.", ("kind",), buckets=SIZE_BUCKETS)
+LLM_RESPONSE_CHARS = REGISTRY.histogram(
+    "llm_response_chars", "Response size in characters.", ("kind",), buckets=SIZE_BUCKETS)
+LLM_RETRIES = REGISTRY.counter("llm_retries_total", "Retried LLM attempts.", ("kind",))
+LLM_COALESCED = REGISTRY.counter(
+    "llm_coalesced_total", "Calls served by waiting on an identical in-flight call.", ("kind",))
+LLM_QUEUE_DEPTH = REGISTRY.gauge("llm_rate_limit_queue_depth", "Calls waiting for (or being granted) a rate-limit token.")
+LLM_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "llm_rate_limit_wait_seconds", "Time spent waiting for a rate-limit token.", ("kind",))
+LLM_SHED = REGISTRY.counter(
+    "llm_shed_total", "Calls rejected by the rate limiter (queue full or deadline too close).", ("kind",))
+LLM_FALLBACKS = REGISTRY.counter(
+    "llm_fallbacks_total", "Responses served from a mock/fallback instead of the model.", ("kind",))
+LLM_PARSE_FAILURES = REGISTRY.counter(
+    "llm_json_parse_failures_total", "Model outputs that could not be parsed as the expected JSON.", ("kind",))
+EVALUATIONS = REGISTRY.counter(
+    "report_evaluations_total", "Report summaries by mode (single prompt or map-reduce).", ("mode",))
+QUESTION_TTFQ_SECONDS = REGISTRY.histogram(
+    "question_stream_first_question_seconds", "Time from /interview/stream request to the first question.")
+
+# --- Caches -------------------------------------------------------------
+CACHE_LOOKUPS = REGISTRY.counter("cache_lookups_total", "Cache lookups by cache and result.", ("cache", "result"))
+
+# --- Uploads ------------------------------------------------------------
+UPLOAD_BYTES = REGISTRY.counter("upload_bytes_total", "Answer video bytes received.", ("mode",))
+UPLOAD_SIZE = REGISTRY.histogram("upload_size_bytes", "Size of saved answer videos.", buckets=SIZE_BUCKETS)
+UPLOAD_WRITE_SECONDS = REGISTRY.histogram(
+    "upload_write_duration_seconds", "Time spent writing upload data to disk.", ("mode",))
+UPLOAD_DUPLICATES = REGISTRY.counter(
+    "upload_duplicates_total", "Retried answer saves answered from the already stored answer.")
+MEDIA_ENCODE_SECONDS = REGISTRY.histogram(
+    "media_encode_seconds", "Time to build an answer's rendition, poster and preview.", ("outcome",),
+    buckets=(1, 2.5, 5, 10, 30, 60, 120, 300, 600))
+MEDIA_ENCODE_BYTES = REGISTRY.counter(
+    "media_encode_bytes_total", "Bytes of originals that got a rendition, and of each derived file.", ("variant",))
+UPLOAD_STORED_BYTES = REGISTRY.gauge(
+    "upload_stored_bytes", "Bytes of answer video referenced by interviews at the last sweep.")
+MEDIA_GC_FILES = REGISTRY.counter("media_gc_files_deleted_total", "Files removed by the media sweeper.", ("reason",))
+MEDIA_GC_BYTES = REGISTRY.counter("media_gc_bytes_reclaimed_total", "Bytes reclaimed by the media sweeper.", ("reason",))
+TRANSCRIBE_SECONDS = REGISTRY.histogram(
+    "transcription_duration_seconds", "Server-side transcription time per answer.", ("engine", "outcome"))
+
+# --- Background jobs ----------------------------------------------------
+JOB_SECONDS = REGISTRY.histogram("job_duration_seconds", "Background job run time.", ("kind", "status"))
+JOBS_QUEUED = REGISTRY.gauge("jobs_pending", "Jobs submitted but not finished in this process.", ("kind",))
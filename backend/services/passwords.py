@@ -0,0 +1,93 @@
+# backend/services/passwords.py
+"""
+Password hashing off the request threads.
+
+scrypt/pbkdf2 are deliberately CPU-heavy. Running them inline let a burst of
+logins occupy every request thread (and core), starving the other routes.
+Hashes now run on a small dedicated pool; hashlib releases the GIL while it
+works, so the pool really does cap how many cores hashing can use. Requests
+wait a bounded time for a slot and are turned away with ``HasherBusy`` when
+the queue is full, instead of piling up.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from services.metrics import PASSWORD_HASH_SECONDS, PASSWORD_HASH_REJECTED, PASSWORD_HASH_WAITING
+
+# Werkzeug method string, e.g. "scrypt:32768:8:1" or "pbkdf2:sha256:600000"
+PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+# threads (and so cores) that may hash at once in each worker process
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# hashes allowed to wait for a free thread before new ones are rejected
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE", "32"))
+# how long a request waits for admission
+PASSWORD_HASH_WAIT = float(os.getenv("PASSWORD_HASH_WAIT", "5"))
+
+
+class HasherBusy(Exception):
+    """Too many hashes queued; the caller should answer 503 and retry later."""
+
+
+def hash_method(password_hash: str) -> str:
+    return (password_hash or "").split("$", 1)[0]
+
+
+class PasswordHasher:
+    def __init__(self, method=PASSWORD_HASH_METHOD, workers=PASSWORD_HASH_WORKERS,
+                 queue=PASSWORD_HASH_QUEUE, wait=PASSWORD_HASH_WAIT):
+        self.method = method
+        self.wait = wait
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="pwhash")
+        self._admission = threading.BoundedSemaphore(max(1, workers) + max(0, queue))
+        self._canonical = None
+
+    @property
+    def canonical_method(self) -> str:
+        """``method`` as it appears in stored hashes (defaults filled in)."""
+        if self._canonical is None:
+            self._canonical = hash_method(generate_password_hash("", self.method))
+        return self._canonical
+
+    def _run(self, op, fn, *args):
+        if not self._admission.acquire(timeout=self.wait):
+            PASSWORD_HASH_REJECTED.inc(op=op)
+            raise HasherBusy("password hashing is saturated")
+        PASSWORD_HASH_WAITING.inc()
+        try:
+            future = self._pool.submit(self._timed, op, fn, *args)
+            return future.result()
+        finally:
+            PASSWORD_HASH_WAITING.dec()
+            self._admission.release()
+
+    @staticmethod
+    def _timed(op, fn, *args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            PASSWORD_HASH_SECONDS.observe(time.perf_counter() - started, op=op)
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", generate_password_hash, password, self.method)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self._run("verify", check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return hash_method(password_hash) != self.canonical_method
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = PasswordHasher()
+    return _hasher
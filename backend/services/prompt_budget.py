@@ -0,0 +1,53 @@
+# backend/services/prompt_budget.py
+"""
+Rough token accounting for prompts.
+
+Exact counts would need the provider's tokenizer or a network round trip, so
+this estimates from length (about four characters per token for English,
+configurable). That is good enough to keep prompts well inside a budget.
+"""
+import os
+
+LLM_CHARS_PER_TOKEN = float(os.getenv("LLM_CHARS_PER_TOKEN", "4"))
+ELLIPSIS = " […] "
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text or "") / LLM_CHARS_PER_TOKEN) + 1
+
+
+def compact(text: str) -> str:
+    """Collapse runs of whitespace (speech transcripts are full of them)."""
+    return " ".join((text or "").split())
+
+
+def fit_text(text: str, max_tokens: int) -> str:
+    """
+    Compact ``text`` and, if it is still over ``max_tokens``, cut the middle
+    out: answers tend to state the approach up front and conclude at the end.
+    """
+    text = compact(text)
+    max_chars = int(max_tokens * LLM_CHARS_PER_TOKEN)
+    if len(text) <= max_chars:
+        return text
+    keep = max(0, max_chars - len(ELLIPSIS))
+    head = keep * 2 // 3
+    return text[:head] + ELLIPSIS + text[len(text) - (keep - head):]
+
+
+def chunk_by_budget(items, cost, budget: int):
+    """
+    Split ``items`` into consecutive chunks whose summed ``cost(item)`` stays
+    within ``budget``. An item bigger than the budget gets a chunk of its own.
+    """
+    chunks, current, used = [], [], 0
+    for item in items:
+        c = cost(item)
+        if current and used + c > budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += c
+    if current:
+        chunks.append(current)
+    return chunks
@@ -0,0 +1,122 @@
+# backend/services/question_bank.py
+import os
+import re
+import json
+import random
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from services.metrics import CACHE_LOOKUPS
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+QUESTION_BANK_DB = os.getenv("QUESTION_BANK_DB", os.path.join(BASE_DIR, "data", "question_bank.db"))
+# off: always call the LLM; exact: reuse the cached list as-is;
+# shuffle: reuse it in a per-candidate order; sample: draw from a larger cached pool
+QUESTION_BANK_MODE = os.getenv("QUESTION_BANK_MODE", "exact")
+QUESTION_BANK_POOL_FACTOR = int(os.getenv("QUESTION_BANK_POOL_FACTOR", "2"))
+
+_NUMBERED_RE = re.compile(r"^\d+\.\s*")
+
+
+def _normalize(text) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+
+def bank_key(role, difficulty, description, num_questions, model="") -> str:
+    """Stable hash of the generation inputs, insensitive to case and whitespace."""
+    parts = [_normalize(role), _normalize(difficulty), _normalize(description), str(int(num_questions)), model]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def renumber(questions):
+    return [f"{i+1}. {_NUMBERED_RE.sub('', q)}" for i, q in enumerate(questions)]
+
+
+class QuestionBank:
+    def __init__(self, path=QUESTION_BANK_DB, mode=QUESTION_BANK_MODE):
+        self.path = path
+        self.mode = mode
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS question_bank (
+                    key TEXT PRIMARY KEY,
+                    role TEXT,
+                    difficulty TEXT,
+                    num_questions INTEGER,
+                    questions TEXT NOT NULL,
+                    created_at TEXT
+                )
+            """)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def pool_size(self, num_questions: int) -> int:
+        """How many questions to ask the LLM for, given the configured mode."""
+        if self.mode == "sample":
+            return int(num_questions) * max(1, QUESTION_BANK_POOL_FACTOR)
+        return int(num_questions)
+
+    def get(self, role, difficulty, description, num_questions, seed=None, model=""):
+        """Return ``num_questions`` cached questions, or None on a miss."""
+        if not self.enabled:
+            return None
+        key = bank_key(role, difficulty, description, num_questions, model)
+        row = self._conn().execute("SELECT questions FROM question_bank WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            CACHE_LOOKUPS.inc(cache="question_bank", result="miss")
+            return None
+        CACHE_LOOKUPS.inc(cache="question_bank", result="hit")
+
+        return self.select(json.loads(row[0]), num_questions, seed)
+
+    def select(self, questions, num_questions, seed=None):
+        """Pick this candidate's questions from a pool according to the mode."""
+        num_questions = int(num_questions)
+        rng = random.Random(seed)
+        if self.mode == "sample" and len(questions) > num_questions:
+            questions = rng.sample(questions, num_questions)
+        elif self.mode in ("shuffle", "sample"):
+            questions = questions[:]
+            rng.shuffle(questions)
+        return renumber(questions[:num_questions])
+
+    def put(self, role, difficulty, description, num_questions, questions, model="") -> None:
+        """Store the full generated pool for these inputs."""
+        if not self.enabled or len(questions) < int(num_questions):
+            return
+        key = bank_key(role, difficulty, description, num_questions, model)
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO question_bank (key, role, difficulty, num_questions, questions, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, role, difficulty, int(num_questions), json.dumps(questions, ensure_ascii=False),
+                 datetime.utcnow().isoformat() + "Z"),
+            )
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    global _bank
+    if _bank is None:
+        with _bank_lock:
+            if _bank is None:
+                _bank = QuestionBank()
+    return _bank
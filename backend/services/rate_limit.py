@@ -0,0 +1,64 @@
+# backend/services/rate_limit.py
+import threading
+import time
+
+
+class RateLimited(Exception):
+    """The call was shed instead of queued; ``retry_after`` is a hint in seconds."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket with a FIFO queue, in reservation form.
+
+    ``rate`` tokens per second refill a bucket of ``burst``. Each caller
+    reserves the next free slot under a lock and then sleeps until it comes
+    up, so callers are served in arrival order without a condition variable.
+    A caller is shed up front (nothing reserved) when the queue is full or
+    when its slot would come after its deadline: waiting would only end in
+    a timeout anyway.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_queue: int = 0):
+        self.rate = float(rate)
+        self.interval = 1.0 / self.rate
+        # how far ahead of "now" the schedule may run before callers wait
+        self.tolerance = (max(1, burst) - 1) * self.interval
+        self.max_queue = max_queue
+        self._tat = 0.0  # theoretical arrival time of the next token
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    def acquire(self, deadline: float = None) -> float:
+        """
+        Take one token, sleeping in line if needed; returns the seconds waited.
+
+        ``deadline`` is a ``time.monotonic()`` value. Raises RateLimited
+        without waiting when the token would not arrive before it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            wait = max(0.0, tat - self.tolerance - now)
+            if wait > 0:
+                if self.max_queue and self._waiting >= self.max_queue:
+                    raise RateLimited("rate limit queue is full", retry_after=wait)
+                if deadline is not None and now + wait > deadline:
+                    raise RateLimited("rate limit wait would exceed the deadline", retry_after=wait)
+                self._waiting += 1
+            self._tat = tat + self.interval
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+        return wait
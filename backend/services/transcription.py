@@ -0,0 +1,275 @@
+# backend/services/transcription.py
+"""
+Server-side transcription of recorded answers.
+
+After an answer is saved, a background job extracts the audio from its webm
+with ffmpeg and runs a local speech-to-text engine on it in a small process
+pool. The result replaces the browser's Web Speech transcript, which is kept
+as ``browser_transcript`` and still used when the engine is off or fails.
+
+CPU use is capped by the number of pool processes, the threads each engine
+may use and the niceness of the workers.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from services import upload_service
+from services.interview_store import get_interview_store, InterviewNotFound
+from services.evaluation import score_answer_job
+from services.metrics import TRANSCRIBE_SECONDS
+
+# none | faster-whisper | vosk | command
+TRANSCRIBE_ENGINE = os.getenv("TRANSCRIBE_ENGINE", "none")
+# faster-whisper model size/path, or the vosk model directory
+TRANSCRIBE_MODEL = os.getenv("TRANSCRIBE_MODEL", "base.en")
+# for the "command" engine: run with {audio} replaced by a 16 kHz mono wav path, transcript on stdout
+TRANSCRIBE_COMMAND = os.getenv("TRANSCRIBE_COMMAND", "")
+TRANSCRIBE_PROCESSES = int(os.getenv("TRANSCRIBE_PROCESSES", "1"))
+TRANSCRIBE_THREADS = int(os.getenv("TRANSCRIBE_THREADS", "1"))  # CPU threads per process
+TRANSCRIBE_NICE = int(os.getenv("TRANSCRIBE_NICE", "10"))
+TRANSCRIBE_TIMEOUT = float(os.getenv("TRANSCRIBE_TIMEOUT", "600"))
+TRANSCRIBE_MAX_AUDIO_SECONDS = int(os.getenv("TRANSCRIBE_MAX_AUDIO_SECONDS", "900"))
+FFMPEG_BIN = os.getenv("FFMPEG_BIN", "ffmpeg")
+
+
+class TranscriptionError(Exception):
+    pass
+
+
+class SpeechEngine:
+    """Turns a 16 kHz mono wav file into text."""
+
+    name = "base"
+
+    def transcribe(self, wav_path: str) -> str:
+        raise NotImplementedError
+
+
+class FasterWhisperEngine(SpeechEngine):
+    name = "faster-whisper"
+
+    def __init__(self, model=TRANSCRIBE_MODEL, threads=TRANSCRIBE_THREADS):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise TranscriptionError("TRANSCRIBE_ENGINE=faster-whisper needs the faster-whisper package")
+        self.model = WhisperModel(model, device="cpu", compute_type="int8", cpu_threads=threads, num_workers=1)
+
+    def transcribe(self, wav_path):
+        segments, _ = self.model.transcribe(wav_path, beam_size=1, vad_filter=True)
+        return " ".join(s.text.strip() for s in segments).strip()
+
+
+class VoskEngine(SpeechEngine):
+    name = "vosk"
+
+    def __init__(self, model=TRANSCRIBE_MODEL):
+        try:
+            import vosk
+        except ImportError:
+            raise TranscriptionError("TRANSCRIBE_ENGINE=vosk needs the vosk package")
+        vosk.SetLogLevel(-1)
+        self._vosk = vosk
+        self.model = vosk.Model(model)
+
+    def transcribe(self, wav_path):
+        import json
+        import wave
+        with wave.open(wav_path, "rb") as wav:
+            rec = self._vosk.KaldiRecognizer(self.model, wav.getframerate())
+            parts = []
+            while True:
+                frames = wav.readframes(8000)
+                if not frames:
+                    break
+                if rec.AcceptWaveform(frames):
+                    parts.append(json.loads(rec.Result()).get("text", ""))
+            parts.append(json.loads(rec.FinalResult()).get("text", ""))
+        return " ".join(p for p in parts if p).strip()
+
+
+class CommandEngine(SpeechEngine):
+    """Any local CLI (whisper.cpp, etc.) that prints the transcript to stdout."""
+
+    name = "command"
+
+    def __init__(self, command=TRANSCRIBE_COMMAND):
+        if "{audio}" not in command:
+            raise TranscriptionError("TRANSCRIBE_COMMAND must contain an {audio} placeholder")
+        self.command = command
+
+    def transcribe(self, wav_path):
+        import shlex
+        args = [a.replace("{audio}", wav_path) for a in shlex.split(self.command)]
+        out = subprocess.run(args, capture_output=True, text=True, timeout=TRANSCRIBE_TIMEOUT)
+        if out.returncode != 0:
+            raise TranscriptionError(f"transcribe command failed: {out.stderr.strip()[:200]}")
+        return " ".join(out.stdout.split())
+
+
+def make_engine(name: str = TRANSCRIBE_ENGINE) -> SpeechEngine:
+    if name == "faster-whisper":
+        return FasterWhisperEngine()
+    if name == "vosk":
+        return VoskEngine()
+    if name == "command":
+        return CommandEngine()
+    raise ValueError(f"Unknown transcription engine: {name}")
+
+
+def extract_audio(video_path: str, wav_path: str) -> None:
+    """Decode the answer's audio track to 16 kHz mono PCM, capped in length."""
+    cmd = [
+        FFMPEG_BIN, "-nostdin", "-v", "error", "-y", "-threads", "1",
+        "-i", video_path, "-vn", "-ac", "1", "-ar", "16000",
+        "-t", str(TRANSCRIBE_MAX_AUDIO_SECONDS), "-f", "wav", wav_path,
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=TRANSCRIBE_TIMEOUT)
+    except FileNotFoundError:
+        raise TranscriptionError(f"{FFMPEG_BIN} not found; install ffmpeg or set FFMPEG_BIN")
+    if out.returncode != 0:
+        raise TranscriptionError(f"ffmpeg could not extract audio: {out.stderr.strip()[:200]}")
+
+
+# --- worker process side --------------------------------------------------
+
+_engine = None
+
+
+def _init_worker(engine_name, threads, nice):
+    global _engine
+    # numeric libraries read these when first imported
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    if nice and hasattr(os, "nice"):
+        os.nice(nice)
+    _engine = make_engine(engine_name)
+
+
+def _transcribe_in_worker(video_path: str) -> str:
+    tmp_dir = tempfile.mkdtemp(prefix="transcribe-")
+    try:
+        wav_path = os.path.join(tmp_dir, "audio.wav")
+        extract_audio(video_path, wav_path)
+        return _engine.transcribe(wav_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# --- app side -------------------------------------------------------------
+
+class Transcriber:
+    """
+    Owns the process pool. Workers are spawned (not forked from the threaded
+    web process) and load the engine's model once at start-up.
+    """
+
+    def __init__(self, engine=TRANSCRIBE_ENGINE, processes=TRANSCRIBE_PROCESSES,
+                 threads=TRANSCRIBE_THREADS, nice=TRANSCRIBE_NICE, timeout=TRANSCRIBE_TIMEOUT):
+        self.engine = engine
+        self.processes = max(1, processes)
+        self.threads = max(1, threads)
+        self.nice = nice
+        self.timeout = timeout
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine not in ("", "none", "off")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.engine, self.threads, self.nice),
+                )
+            return self._pool
+
+    def _reset_pool(self, pool, terminate=False):
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        if terminate:
+            # shutdown() does not stop a running task; a hung one would hold its
+            # process (and the model's memory) until it finished by itself
+            for process in list((getattr(pool, "_processes", None) or {}).values()):
+                process.terminate()
+
+    def transcribe(self, video_path: str) -> str:
+        started = time.perf_counter()
+        outcome = "error"
+        pool = self._get_pool()
+        try:
+            text = pool.submit(_transcribe_in_worker, video_path).result(timeout=self.timeout)
+            outcome = "ok"
+            return text
+        except FutureTimeout:
+            # the worker is still busy with this file; replace the pool so later
+            # answers do not queue behind it
+            self._reset_pool(pool, terminate=True)
+            raise TranscriptionError(f"transcription took longer than {self.timeout:.0f}s")
+        except BrokenProcessPool:
+            # a worker died (OOM, crash in native code); start fresh next time
+            self._reset_pool(pool)
+            raise TranscriptionError("transcription worker crashed")
+        finally:
+            TRANSCRIBE_SECONDS.observe(time.perf_counter() - started, engine=self.engine, outcome=outcome)
+
+
+_transcriber = None
+_transcriber_lock = threading.Lock()
+
+
+def get_transcriber() -> Transcriber:
+    global _transcriber
+    if _transcriber is None:
+        with _transcriber_lock:
+            if _transcriber is None:
+                _transcriber = Transcriber()
+    return _transcriber
+
+
+def transcribe_answer_job(interview_id: str, index: int, rev: str):
+    """
+    Background job: transcribe one saved answer, store the text on it, then
+    score it so the evaluation sees the server transcript.
+    """
+    try:
+        state = get_interview_store().load(interview_id)
+    except InterviewNotFound:
+        return None
+    answer = next((a for a in state["answers"] if int(a["index"]) == int(index)), None)
+    if answer is None or answer.get("rev") != rev:
+        return None  # re-recorded since the job was queued
+
+    transcriber = get_transcriber()
+    fields = {"transcription": "failed"}
+    path = upload_service.video_path(answer)
+    try:
+        if path is None:
+            raise TranscriptionError("video file is missing")
+        text = transcriber.transcribe(path)
+    except Exception as e:
+        print(f"WARNING: transcription of {interview_id}#{index} failed, keeping browser transcript:", e)
+    else:
+        fields["transcription"] = "done"
+        if text:
+            fields.update(transcript=text, transcript_source=transcriber.engine)
+    get_interview_store().update_answer(interview_id, index, expect_rev=rev, **fields)
+    return score_answer_job(interview_id, index, rev)
+
+
+def transcribe_job_key(interview_id: str, index: int, rev: str) -> str:
+    return f"transcribe:{interview_id}:{int(index)}:{rev}"
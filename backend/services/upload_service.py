@@ -0,0 +1,198 @@
+# backend/services/upload_service.py
+import os
+import json
+import re
+import shutil
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+try:
+    import fcntl
+except ImportError:  # not on Windows; uploads then rely on the client sending one chunk at a time
+    fcntl = None
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+UPLOAD_TMP_DIR = os.getenv("UPLOAD_TMP_DIR", os.path.join(BASE_DIR, "data", "upload_tmp"))
+# Saved answer videos live outside the static folder and are only served
+# through the owner-checked video route; older builds wrote them under
+# frontend/static/uploads, which is still searched for existing answers.
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", os.path.join(BASE_DIR, "data", "uploads"))
+LEGACY_UPLOAD_DIR = os.path.join(os.path.dirname(BASE_DIR), "frontend", "static", "uploads")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(500 * 1024 * 1024)))
+COPY_BUFFER_BYTES = 64 * 1024
+
+_UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_VIDEO_NAME_RE = re.compile(r"^[0-9a-f]{32}\.webm$")
+# files the media worker derives from an answer video: <stem>.<suffix>
+DERIVED_SUFFIXES = {"rendition": "rendition.webm", "preview": "preview.webm", "poster": "poster.jpg"}
+DERIVED_MIMETYPES = {"rendition": "video/webm", "preview": "video/webm", "poster": "image/jpeg"}
+_DERIVED_NAME_RE = re.compile(r"^[0-9a-f]{32}\.(rendition\.webm|preview\.webm|poster\.jpg)$")
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400, offset=None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def _paths(upload_id: str):
+    if not _UPLOAD_ID_RE.match(upload_id or ""):
+        raise UploadError("Invalid upload id", 400)
+    base = os.path.join(UPLOAD_TMP_DIR, upload_id)
+    return base + ".part", base + ".meta.json"
+
+
+def start_upload(owner: str, interview_id: str, q_index: int) -> dict:
+    """Create an empty partial file and return the new upload descriptor."""
+    os.makedirs(UPLOAD_TMP_DIR, exist_ok=True)
+    upload_id = uuid4().hex
+    part, meta_path = _paths(upload_id)
+    meta = {
+        "upload_id": upload_id,
+        "owner": owner,
+        "interview_id": interview_id,
+        "q_index": q_index,
+        "started_at": time.time(),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    open(part, "wb").close()
+    return {"upload_id": upload_id, "offset": 0}
+
+
+def _load_meta(upload_id: str, owner: str) -> dict:
+    part, meta_path = _paths(upload_id)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise UploadError("Unknown upload", 404)
+    if meta.get("owner") != owner:
+        raise UploadError("Unknown upload", 404)
+    return meta
+
+
+@contextmanager
+def _locked_part(part: str):
+    """
+    Open the partial file under an exclusive lock, shared by every worker.
+
+    Held across the offset check and the write so a retried chunk cannot be
+    appended twice. A finalize that won the race has moved the file by the
+    time the lock is granted, which is reported as an unknown upload.
+    """
+    try:
+        f = open(part, "r+b")
+    except FileNotFoundError:
+        raise UploadError("Unknown upload", 404)
+    with f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if not os.path.samestat(os.fstat(f.fileno()), os.stat(part)):
+                raise FileNotFoundError(part)
+        except FileNotFoundError:
+            raise UploadError("Unknown upload", 404)
+        yield f
+
+
+def upload_status(upload_id: str, owner: str) -> dict:
+    _load_meta(upload_id, owner)
+    part, _ = _paths(upload_id)
+    return {"upload_id": upload_id, "offset": os.path.getsize(part)}
+
+
+def append_chunk(upload_id: str, owner: str, offset: int, stream) -> int:
+    """
+    Append ``stream`` to the partial file at ``offset``.
+
+    The offset must equal the bytes already stored; anything else is rejected
+    with the current offset so the client can resume from there. The body is
+    copied in fixed-size blocks so worker memory stays flat.
+    """
+    _load_meta(upload_id, owner)
+    part, _ = _paths(upload_id)
+    with _locked_part(part) as f:
+        size = f.seek(0, os.SEEK_END)
+        if offset != size:
+            raise UploadError("Offset mismatch", 409, offset=size)
+        written = 0
+        while True:
+            block = stream.read(COPY_BUFFER_BYTES)
+            if not block:
+                break
+            written += len(block)
+            if size + written > MAX_UPLOAD_BYTES:
+                f.truncate(size)
+                raise UploadError("Upload too large", 413, offset=size)
+            f.write(block)
+        return size + written
+
+
+def finalize_upload(upload_id: str, owner: str, interview_id: str, q_index: int, dest_path: str) -> int:
+    """Move the completed partial file to ``dest_path``; returns its size."""
+    meta = _load_meta(upload_id, owner)
+    if meta["interview_id"] != interview_id or int(meta["q_index"]) != q_index:
+        raise UploadError("Upload does not belong to this answer", 400)
+    part, meta_path = _paths(upload_id)
+    with _locked_part(part) as f:
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            raise UploadError("Empty upload", 400)
+        shutil.move(part, dest_path)
+    os.remove(meta_path)
+    return size
+
+
+def is_video_name(name: str) -> bool:
+    return bool(_VIDEO_NAME_RE.match(name or ""))
+
+
+def new_video_path():
+    """Return ``(filename, path)`` for a fresh answer video in UPLOAD_DIR."""
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    filename = f"{uuid4().hex}.webm"
+    return filename, os.path.join(UPLOAD_DIR, filename)
+
+
+def video_path(answer: dict):
+    """
+    Locate the video file of a saved answer, or None if it is gone.
+
+    Answers store ``video_file``; older ones only have a
+    ``/static/uploads/<name>`` URL, so fall back to its basename.
+    """
+    name = answer.get("video_file") or os.path.basename(answer.get("video_url") or "")
+    if not is_video_name(name):
+        return None
+    for directory in (UPLOAD_DIR, LEGACY_UPLOAD_DIR):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def is_derived_name(name: str) -> bool:
+    return bool(_DERIVED_NAME_RE.match(name or ""))
+
+
+def derived_name(video_file: str, variant: str) -> str:
+    return f"{os.path.splitext(video_file)[0]}.{DERIVED_SUFFIXES[variant]}"
+
+
+def derived_path(answer: dict, variant: str):
+    """Locate one of the answer's derived files (``answer["media"][variant]``), or None."""
+    name = (answer.get("media") or {}).get(variant)
+    if not is_derived_name(name):
+        return None
+    for directory in (UPLOAD_DIR, LEGACY_UPLOAD_DIR):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def derived_paths(answer: dict) -> list:
+    return [p for p in (derived_path(answer, v) for v in DERIVED_SUFFIXES) if p]
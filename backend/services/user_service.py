@@ -1,23 +1,10 @@
 # backend/services/user_service.py
-import os, json, re
-from werkzeug.security import generate_password_hash, check_password_hash
-
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-USERS_FILE = os.path.join(BASE_DIR, "users.json")
-
-def ensure_users_file():
-    if not os.path.exists(USERS_FILE):
-        with open(USERS_FILE, "w") as f:
-            json.dump([], f)
+import re
+from services.user_store import get_user_store
+from services.passwords import get_password_hasher, HasherBusy
 
 def load_users():
-    ensure_users_file()
-    with open(USERS_FILE, "r") as f:
-        return json.load(f)
-
-def save_users(users):
-    with open(USERS_FILE, "w") as f:
-        json.dump(users, f, indent=4)
+    return get_user_store().all()
 
 def is_valid_password(password):
     # at least 8 chars, upper, lower, digit, special
@@ -30,20 +17,21 @@ def is_valid_password(password):
     return True
 
 def add_user(name, email, password):
-    users = load_users()
-    if any(u["email"] == email for u in users):
-        return False
-    hashed = generate_password_hash(password)
-    users.append({"name": name, "email": email, "password": hashed})
-    save_users(users)
-    return True
+    hashed = get_password_hasher().hash(password)
+    return get_user_store().add({"name": name, "email": email, "password": hashed})
 
 def find_user_by_email(email):
-    users = load_users()
-    return next((u for u in users if u["email"] == email), None)
+    return get_user_store().get(email)
 
 def verify_user(email, password):
     user = find_user_by_email(email)
-    if user and check_password_hash(user["password"], password):
+    hasher = get_password_hasher()
+    if user and hasher.verify(user["password"], password):
+        # upgrade hashes made with older method/cost settings while we have the password
+        if hasher.needs_rehash(user["password"]):
+            try:
+                get_user_store().set_password(email, hasher.hash(password))
+            except HasherBusy:
+                pass  # try again on a later login
         return user
     return None
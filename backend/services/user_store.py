@@ -0,0 +1,242 @@
+# backend/services/user_store.py
+import os
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+USERS_FILE = os.path.join(BASE_DIR, "users.json")
+USERS_DB = os.getenv("USERS_DB", os.path.join(BASE_DIR, "data", "users.db"))
+USER_STORE_BACKEND = os.getenv("USER_STORE_BACKEND", "sqlite")
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+
+
+class UserStore:
+    """Minimal interface every user backend implements."""
+
+    def get(self, email):
+        raise NotImplementedError
+
+    def add(self, user) -> bool:
+        """Insert a user dict; return False if the email is already taken."""
+        raise NotImplementedError
+
+    def set_password(self, email, password_hash) -> bool:
+        """Replace a user's stored hash; return False if the user does not exist."""
+        raise NotImplementedError
+
+    def all(self):
+        raise NotImplementedError
+
+
+class JsonUserStore(UserStore):
+    """Legacy single-file backend, kept for small setups and for migration."""
+
+    def __init__(self, path=USERS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def get(self, email):
+        return next((u for u in self._read() if u["email"] == email), None)
+
+    def add(self, user):
+        with self._lock:
+            users = self._read()
+            if any(u["email"] == user["email"] for u in users):
+                return False
+            users.append(user)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(users, f)
+            os.replace(tmp, self.path)
+        return True
+
+    def set_password(self, email, password_hash):
+        with self._lock:
+            users = self._read()
+            user = next((u for u in users if u["email"] == email), None)
+            if user is None:
+                return False
+            user["password"] = password_hash
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(users, f)
+            os.replace(tmp, self.path)
+        return True
+
+    def all(self):
+        return self._read()
+
+
+class SqliteUserStore(UserStore):
+    """SQLite backend with a unique index on email; one connection per thread."""
+
+    def __init__(self, path=USERS_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    email TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    created_at TEXT
+                )
+            """)
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _row_to_user(row):
+        if row is None:
+            return None
+        return {"name": row["name"], "email": row["email"], "password": row["password"]}
+
+    def get(self, email):
+        row = self._conn().execute(
+            "SELECT name, email, password FROM users WHERE email = ?", (email,)
+        ).fetchone()
+        return self._row_to_user(row)
+
+    def add(self, user):
+        try:
+            with self._conn() as conn:
+                conn.execute(
+                    "INSERT INTO users (email, name, password, created_at) VALUES (?, ?, ?, ?)",
+                    (user["email"], user["name"], user["password"],
+                     user.get("created_at") or datetime.utcnow().isoformat() + "Z"),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def set_password(self, email, password_hash):
+        with self._conn() as conn:
+            cur = conn.execute("UPDATE users SET password = ? WHERE email = ?", (password_hash, email))
+        return cur.rowcount > 0
+
+    def all(self):
+        rows = self._conn().execute("SELECT name, email, password FROM users ORDER BY id")
+        return [self._row_to_user(r) for r in rows]
+
+    def migrate_json(self, path=USERS_FILE):
+        """Import the legacy users.json exactly once; returns the number of rows imported."""
+        conn = self._conn()
+        with conn:
+            # take the write lock before the check so two workers cannot both import
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if done or not os.path.exists(path):
+                return 0
+            with open(path, "r") as f:
+                users = json.load(f)
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO users (email, name, password, created_at) VALUES (?, ?, ?, ?)",
+                [(u["email"], u["name"], u["password"], u.get("created_at")) for u in users],
+            )
+            imported = conn.total_changes - before
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.utcnow().isoformat() + "Z",),
+            )
+        print(f"INFO: migrated {imported} users from {path} to {self.path}")
+        return imported
+
+
+class CachedUserStore(UserStore):
+    """
+    In-process LRU read cache in front of another store.
+
+    Only hits are cached: a miss may be filled by another worker at any time,
+    so negative answers always go to the backend. Writes invalidate the entry.
+    """
+
+    def __init__(self, backend, max_size=USER_CACHE_SIZE):
+        self.backend = backend
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by every invalidation
+
+    def get(self, email):
+        with self._lock:
+            user = self._cache.get(email)
+            if user is not None:
+                self._cache.move_to_end(email)
+                return dict(user)
+            generation = self._generation
+        user = self.backend.get(email)
+        if user is not None:
+            with self._lock:
+                if generation != self._generation:
+                    return user  # a write landed while we read; it may be older than that
+                self._cache[email] = dict(user)
+                self._cache.move_to_end(email)
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return user
+
+    # invalidate after the write: a get() racing the write could otherwise
+    # re-cache the old record, which would then live until LRU eviction
+    def add(self, user):
+        try:
+            return self.backend.add(user)
+        finally:
+            self.invalidate(user["email"])
+
+    def set_password(self, email, password_hash):
+        try:
+            return self.backend.set_password(email, password_hash)
+        finally:
+            self.invalidate(email)
+
+    def all(self):
+        return self.backend.all()
+
+    def invalidate(self, email=None):
+        with self._lock:
+            self._generation += 1
+            if email is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(email, None)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_user_store() -> UserStore:
+    """Return the process-wide user store, creating (and migrating) it on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if USER_STORE_BACKEND == "json":
+                    backend = JsonUserStore()
+                else:
+                    backend = SqliteUserStore()
+                    backend.migrate_json()
+                _store = CachedUserStore(backend)
+    return _store
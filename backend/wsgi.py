@@ -0,0 +1,13 @@
+# backend/wsgi.py
+"""
+WSGI entry point for production servers.
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Any WSGI server works (``waitress-serve --port=8000 wsgi:app`` on Windows);
+gunicorn.conf.py holds the worker/thread settings.
+"""
+from app import create_app
+
+app = create_app()
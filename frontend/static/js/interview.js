@@ -0,0 +1,490 @@
+// frontend/static/js/interview.js
+// Interview page: question streaming, recording, chunked uploads and the
+// background answer upload queue. Server data comes from #app's data-*
+// attributes and the #questionsData JSON block in interview.html.
+// --- Data from server (filled in by the question stream when starting fresh) ---
+const appRoot = document.getElementById('app');
+const QUESTIONS = JSON.parse(document.getElementById('questionsData').textContent);
+let INTERVIEW_ID = appRoot.dataset.interviewId;
+let TOTAL = parseInt(appRoot.dataset.total, 10) || 0;
+let waitingForQuestion = false;
+
+// --- Elements ---
+const qTitle = document.getElementById('qTitle');
+const qIndexPill = document.getElementById('qIndex');
+const qText = document.getElementById('qText');
+const preview = document.getElementById('preview');
+const startBtn = document.getElementById('startBtn');
+const stopBtn = document.getElementById('stopBtn');
+const saveBtn = document.getElementById('saveBtn');
+const nextBtn = document.getElementById('nextBtn');
+const transcriptEl = document.getElementById('transcript');
+const recStatus = document.getElementById('recStatus');
+const reportBtn = document.getElementById('reportBtn');
+const uploadList = document.getElementById('uploadList');
+
+// --- Recording state ---
+let current = 0;
+let mediaStream = null;
+let recorder = null;
+let chunks = [];
+let lastBlob = null;
+
+// --- Chunked upload state (timeslices are sent while recording) ---
+const CHUNK_MS = 2000;
+const MAX_CHUNK_RETRIES = 5;
+let upload = null;  // { id, offset, queue, sending, failed, done }
+
+// --- Saved answers still being sent (kept in IndexedDB so a reload resumes them) ---
+const SAVE_URL = appRoot.dataset.saveUrl;
+const MAX_BACKOFF_MS = 30000;
+const pendingUploads = [];  // { clientUploadId, interviewId, qIndex, question, transcript, blob, attempts, createdAt }
+const liveUploads = {};     // clientUploadId -> chunked upload started while recording on this page
+let uploadWorker = null;
+let savedCount = 0;
+
+// --- Speech Recognition (browser) ---
+let recognition = null;
+let transcriptBuffer = "";
+
+function supportsSpeech() {
+  return 'webkitSpeechRecognition' in window || 'SpeechRecognition' in window;
+}
+
+function startSpeech() {
+  if (!supportsSpeech()) return;
+  const SR = window.SpeechRecognition || window.webkitSpeechRecognition;
+  recognition = new SR();
+  recognition.lang = 'en-US';
+  recognition.continuous = true;
+  recognition.interimResults = true;
+  transcriptBuffer = "";
+  recognition.onresult = (e) => {
+    let interim = "";
+    for (let i = e.resultIndex; i < e.results.length; i++) {
+      const res = e.results[i];
+      if (res.isFinal) transcriptBuffer += res[0].transcript + " ";
+      else interim += res[0].transcript;
+    }
+    transcriptEl.value = (transcriptBuffer + interim).trim();
+  };
+  recognition.onerror = () => {};
+  recognition.start();
+}
+
+function stopSpeech() {
+  if (recognition) {
+    try { recognition.stop(); } catch (e) {}
+    recognition = null;
+  }
+}
+
+function setBtn(el, enabled) {
+  if (enabled) el.classList.remove('btn-disabled'); else el.classList.add('btn-disabled');
+  el.disabled = !enabled;
+}
+
+async function startUpload(qIndex) {
+  const fd = new FormData();
+  fd.append("interview_id", INTERVIEW_ID);
+  fd.append("q_index", String(qIndex));
+  const state = { id: null, offset: 0, queue: [], sending: null, failed: false };
+  try {
+    const res = await fetch(appRoot.dataset.uploadStartUrl, { method: "POST", body: fd });
+    const data = await res.json();
+    if (!data.ok) throw new Error(data.error || "Upload start failed");
+    state.id = data.upload_id;
+  } catch (e) {
+    state.failed = true;  // fall back to a single POST on save
+  }
+  return state;
+}
+
+function chunkUrl(u) {
+  return appRoot.dataset.uploadChunkUrl.replace('__ID__', u.id);
+}
+
+async function sendChunk(u, blob) {
+  for (let attempt = 0; attempt <= MAX_CHUNK_RETRIES; attempt++) {
+    try {
+      const res = await fetch(`${chunkUrl(u)}?offset=${u.offset}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/octet-stream" },
+        body: blob
+      });
+      const data = await res.json();
+      if (data.ok) { u.offset = data.offset; return; }
+      if (res.status === 409 && data.offset !== null) {
+        // server already has part of this chunk: resume from its offset
+        const have = data.offset - u.offset;
+        if (have < 0) throw desyncError();
+        if (have >= blob.size) { u.offset = data.offset; return; }
+        if (have > 0) { blob = blob.slice(have); u.offset = data.offset; continue; }
+      }
+      throw new Error(data.error || "Chunk rejected");
+    } catch (e) {
+      if (e.fatal || attempt === MAX_CHUNK_RETRIES) throw e;
+      await new Promise(r => setTimeout(r, 500 * 2 ** attempt));
+      let data = null;
+      try {
+        data = await (await fetch(chunkUrl(u))).json();
+      } catch (_) {}
+      if (data && data.ok) {
+        const have = data.offset - u.offset;
+        if (have < 0) throw desyncError();
+        if (have >= blob.size) { u.offset = data.offset; return; }
+        if (have > 0) { blob = blob.slice(have); u.offset = data.offset; }
+      }
+    }
+  }
+  throw new Error("Chunk not accepted");
+}
+
+// The server holds less than we already sent: the stored file cannot be trusted
+function desyncError() {
+  const e = new Error("Upload out of sync with the server");
+  e.fatal = true;
+  return e;
+}
+
+function pumpUpload(u) {
+  if (!u || u.failed || !u.id || u.sending || !u.queue.length) return u && u.sending;
+  const blob = u.queue.shift();
+  u.sending = sendChunk(u, blob)
+    .catch(() => { u.failed = true; })
+    .finally(() => { u.sending = null; pumpUpload(u); });
+  return u.sending;
+}
+
+async function flushUpload(u) {
+  while (u && !u.failed && (u.sending || u.queue.length)) {
+    await (u.sending || pumpUpload(u));
+  }
+  return u && !u.failed && u.id;
+}
+
+function openUploadDb() {
+  return new Promise(resolve => {
+    if (!window.indexedDB) return resolve(null);
+    const req = indexedDB.open("interview-uploads", 1);
+    req.onupgradeneeded = () => req.result.createObjectStore("answers", { keyPath: "clientUploadId" });
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => resolve(null);
+  });
+}
+const uploadDb = openUploadDb();
+
+// Run one request on the "answers" store; resolves to its result, or null if storage is unavailable
+async function idb(mode, fn) {
+  const db = await uploadDb;
+  if (!db) return null;
+  return new Promise(resolve => {
+    try {
+      const tx = db.transaction("answers", mode);
+      const req = fn(tx.objectStore("answers"));
+      tx.oncomplete = () => resolve(req.result);
+      tx.onerror = tx.onabort = () => resolve(null);
+    } catch (e) {
+      resolve(null);
+    }
+  });
+}
+
+function newClientUploadId() {
+  if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+  return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+function showUpload(rec, text, cls) {
+  let li = document.getElementById(`upload-${rec.clientUploadId}`);
+  if (!li) {
+    li = document.createElement('li');
+    li.id = `upload-${rec.clientUploadId}`;
+    uploadList.appendChild(li);
+  }
+  li.className = cls || "";
+  li.textContent = `Answer ${rec.qIndex + 1}: ${text}`;
+}
+
+function updateReportBtn() {
+  setBtn(reportBtn, TOTAL > 0 && savedCount >= TOTAL && !pendingUploads.length);
+}
+
+function postAnswer(fd, onProgress) {
+  // XHR rather than fetch: it reports upload progress
+  return new Promise((resolve, reject) => {
+    const xhr = new XMLHttpRequest();
+    xhr.open("POST", SAVE_URL);
+    xhr.upload.onprogress = e => { if (e.lengthComputable) onProgress(e.loaded / e.total); };
+    xhr.onload = () => {
+      let data = {};
+      try { data = JSON.parse(xhr.responseText); } catch (_) {}
+      resolve({ status: xhr.status, data });
+    };
+    xhr.onerror = xhr.ontimeout = () => reject(new Error("network error"));
+    xhr.send(fd);
+  });
+}
+
+async function sendRecord(rec) {
+  const fd = new FormData();
+  fd.append("interview_id", rec.interviewId);
+  fd.append("q_index", String(rec.qIndex));
+  fd.append("question", rec.question);
+  fd.append("transcript", rec.transcript);
+  fd.append("client_upload_id", rec.clientUploadId);
+
+  // Most of the video may already be on the server; only the tail is left
+  const live = liveUploads[rec.clientUploadId];
+  if (live) showUpload(rec, "finishing upload…");
+  const uploadId = live ? await flushUpload(live) : null;
+  if (uploadId) fd.append("upload_id", uploadId);
+  else fd.append("video", rec.blob, `answer_${rec.qIndex+1}.webm`);
+
+  const res = await postAnswer(fd, p => showUpload(rec, `uploading ${Math.round(p * 100)}%`));
+  if (res.status === 200 && res.data.ok) return res.data;
+  const err = new Error(res.data.error || `HTTP ${res.status}`);
+  if (uploadId) {
+    delete liveUploads[rec.clientUploadId];  // resend the whole recording next time
+    err.retry = true;
+  } else {
+    err.retry = res.status >= 500 || [401, 408, 429].includes(res.status);
+  }
+  throw err;
+}
+
+async function runUploads() {
+  while (pendingUploads.length) {
+    const rec = pendingUploads[0];
+    try {
+      const data = await sendRecord(rec);
+      pendingUploads.shift();
+      delete liveUploads[rec.clientUploadId];
+      await idb("readwrite", s => s.delete(rec.clientUploadId));
+      if (rec.interviewId === INTERVIEW_ID) savedCount = Math.max(savedCount, data.saved_count);
+      showUpload(rec, `saved (${data.saved_count}/${TOTAL || "?"})`, "success");
+    } catch (e) {
+      if (e.retry === false) {
+        pendingUploads.shift();
+        await idb("readwrite", s => s.delete(rec.clientUploadId));
+        showUpload(rec, `not saved: ${e.message}. Please record it again.`, "warn");
+        continue;
+      }
+      rec.attempts = (rec.attempts || 0) + 1;
+      const delay = Math.min(MAX_BACKOFF_MS, 1000 * 2 ** (rec.attempts - 1)) * (0.5 + Math.random() / 2);
+      showUpload(rec, `retrying in ${Math.ceil(delay / 1000)}s (${e.message})`, "warn");
+      await new Promise(r => setTimeout(r, delay));
+    }
+  }
+}
+
+function drainUploads() {
+  if (!uploadWorker) {
+    uploadWorker = runUploads().finally(() => { uploadWorker = null; updateReportBtn(); });
+  }
+  return uploadWorker;
+}
+
+async function resumeUploads() {
+  const stored = await idb("readonly", s => s.getAll());
+  (stored || []).sort((a, b) => a.createdAt - b.createdAt).forEach(rec => {
+    rec.persisted = true;
+    pendingUploads.push(rec);
+    showUpload(rec, "waiting to upload (restored)");
+  });
+  if (pendingUploads.length) drainUploads();
+}
+
+function loadQuestion(i) {
+  if (QUESTIONS[i] === undefined) {
+    // still streaming in: show a placeholder and load it when it arrives
+    waitingForQuestion = true;
+    qTitle.textContent = "Interview Question";
+    qIndexPill.textContent = `#${i+1} of ${TOTAL}`;
+    qText.textContent = "Generating question…";
+    [startBtn, stopBtn, saveBtn, nextBtn].forEach(b => setBtn(b, false));
+    return;
+  }
+  waitingForQuestion = false;
+  const raw = QUESTIONS[i] || "";
+  const cleaned = raw.replace(/^\d+\.\s*/, ''); // drop leading "1. "
+  qTitle.textContent = "Interview Question";
+  qIndexPill.textContent = `#${i+1} of ${TOTAL}`;
+  qText.textContent = cleaned;
+
+  // reset UI
+  preview.classList.add('hidden');
+  preview.src = "";
+  transcriptEl.value = "";
+  lastBlob = null;
+  setBtn(startBtn, true);
+  setBtn(stopBtn, false);
+  setBtn(saveBtn, false);
+  setBtn(nextBtn, false);
+  recStatus.textContent = "";
+}
+
+async function startRecording() {
+  try {
+    mediaStream = await navigator.mediaDevices.getUserMedia({ video: true, audio: true });
+    const mime = MediaRecorder.isTypeSupported('video/webm;codecs=vp9')
+      ? 'video/webm;codecs=vp9'
+      : 'video/webm';
+    recorder = new MediaRecorder(mediaStream, { mimeType: mime });
+    chunks = [];
+    upload = await startUpload(current);
+    const recUpload = upload;
+    recorder.ondataavailable = e => {
+      if (!e.data.size) return;
+      chunks.push(e.data);
+      if (!recUpload.failed) { recUpload.queue.push(e.data); pumpUpload(recUpload); }
+    };
+    recorder.onstop = () => {
+      lastBlob = new Blob(chunks, { type: 'video/webm' });
+      preview.src = URL.createObjectURL(lastBlob);
+      preview.classList.remove('hidden');
+      setBtn(saveBtn, true);
+    };
+    recorder.start(CHUNK_MS);
+    startSpeech();
+    recStatus.textContent = "Recording…";
+    setBtn(startBtn, false);
+    setBtn(stopBtn, true);
+    setBtn(saveBtn, false);
+    setBtn(nextBtn, false);
+  } catch (err) {
+    recStatus.innerHTML = `<span class="warn">Mic/Camera permission denied.</span>`;
+  }
+}
+
+function stopRecording() {
+  try { recorder && recorder.stop(); } catch (e) {}
+  mediaStream && mediaStream.getTracks().forEach(t => t.stop());
+  stopSpeech();
+  recStatus.textContent = "Stopped. Preview generated.";
+  setBtn(stopBtn, false);
+}
+
+async function saveAnswer() {
+  if (!lastBlob) {
+    recStatus.innerHTML = `<span class="warn">No recording to save.</span>`;
+    return;
+  }
+  const rec = {
+    clientUploadId: newClientUploadId(),
+    interviewId: INTERVIEW_ID,
+    qIndex: current,
+    question: qText.textContent,
+    transcript: transcriptEl.value || "",
+    blob: lastBlob,
+    attempts: 0,
+    createdAt: Date.now()
+  };
+  if (upload && !upload.failed) liveUploads[rec.clientUploadId] = upload;
+  upload = null;
+  lastBlob = null;
+  setBtn(saveBtn, false);
+  setBtn(reportBtn, false);
+
+  // Queue it and move on; the upload finishes in the background
+  rec.persisted = (await idb("readwrite", s => s.put(rec))) !== null;
+  pendingUploads.push(rec);
+  showUpload(rec, "queued");
+  recStatus.innerHTML = rec.persisted
+    ? `<span class="success">Saved. Uploading in the background; you can continue.</span>`
+    : `<span class="success">Saved. Uploading in the background; keep this tab open until it finishes.</span>`;
+  setBtn(nextBtn, true);
+  drainUploads();
+}
+
+function nextQuestion() {
+  if (current < TOTAL - 1) {
+    current += 1;
+    loadQuestion(current);
+  } else {
+    recStatus.innerHTML = `<span class="success">All questions completed. You can generate the report.</span>`;
+    setBtn(nextBtn, false);
+  }
+}
+
+// Bind
+startBtn.addEventListener('click', startRecording);
+stopBtn.addEventListener('click', stopRecording);
+saveBtn.addEventListener('click', saveAnswer);
+nextBtn.addEventListener('click', nextQuestion);
+
+// --- Question streaming (Server-Sent Events over fetch) ---
+const setupForm = document.getElementById('setupForm');
+
+function onStreamEvent(type, data) {
+  if (type === 'interview') {
+    INTERVIEW_ID = data.interview_id;
+    TOTAL = data.num_questions;
+    document.getElementById('introText').textContent = data.intro;
+    document.getElementById('rolePill').textContent = data.role;
+    document.getElementById('difficultyPill').textContent = data.difficulty;
+    document.getElementById('totalPill').textContent = data.num_questions;
+    document.getElementById('setupArea').classList.add('hidden');
+    document.getElementById('interviewArea').classList.remove('hidden');
+    loadQuestion(current);
+  } else if (type === 'intro') {
+    document.getElementById('introText').textContent = data.intro;
+  } else if (type === 'question') {
+    QUESTIONS[data.index] = data.text;
+    if (waitingForQuestion && data.index === current) loadQuestion(current);
+  } else if (type === 'done') {
+    data.questions.forEach((q, i) => { QUESTIONS[i] = q; });
+    if (waitingForQuestion) loadQuestion(current);
+  } else if (type === 'error') {
+    recStatus.innerHTML = `<span class="warn">${data.error}</span>`;
+  }
+}
+
+async function readEvents(body, onEvent) {
+  const reader = body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf("\n\n")) !== -1) {
+      const raw = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let type = "message", data = "";
+      raw.split("\n").forEach(line => {
+        if (line.startsWith("event: ")) type = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      });
+      onEvent(type, data ? JSON.parse(data) : null);
+    }
+  }
+}
+
+if (setupForm && window.ReadableStream && window.TextDecoder) {
+  setupForm.addEventListener('submit', async (ev) => {
+    ev.preventDefault();
+    const generateBtn = document.getElementById('generateBtn');
+    setBtn(generateBtn, false);
+    document.getElementById('setupStatus').textContent = "Generating questions…";
+    try {
+      const res = await fetch(appRoot.dataset.streamUrl, { method: "POST", body: new FormData(setupForm) });
+      if (!res.ok || !res.body) throw new Error("stream unavailable");
+      await readEvents(res.body, onStreamEvent);
+    } catch (e) {
+      // fall back to the classic full-page form post
+      if (!INTERVIEW_ID) setupForm.submit();
+      else recStatus.innerHTML = `<span class="warn">Lost connection while generating questions.</span>`;
+    }
+  });
+}
+
+window.addEventListener('beforeunload', (e) => {
+  // answers that could not be stored locally are lost if the page goes away
+  if (pendingUploads.some(r => !r.persisted)) { e.preventDefault(); e.returnValue = ""; }
+});
+
+// Init
+if (TOTAL) loadQuestion(current);
+resumeUploads();